@@ -6,9 +6,12 @@ Handles all user-facing commands and voice state events.
 from __future__ import annotations
 
 import asyncio
+import collections
+import functools
 import os
 import logging
 import re
+import time
 from pathlib import Path
 
 import discord
@@ -16,27 +19,119 @@ from discord import app_commands
 from discord.ext import commands
 
 from core.music_player import MusicPlayer, LoopMode, AutoplayMode
-from core.ytdl_source import Track, YTDLSource
+from core.ytdl_source import Track, YTDLSource, close_http_session
 from utils.embed_builder import EmbedBuilder
 from utils.memory_debug import MemoryMonitor
 from utils.now_playing_view import NowPlayingView
 from utils.genius_lyrics import search_lyrics, split_lyrics
+from utils.lrclib_lyrics import close_session as close_lrclib_session
 from utils.lyrics_service import get_lyrics_concurrently
 from utils.playlist_store import PlaylistStore
 from utils.radio_browser import RADIO_CATEGORY_PRESETS, RADIO_PAGE_SIZE, RadioBrowserClient
+from utils.text_utils import truncate
 
 logger = logging.getLogger('omnia.music')
 
 
+def _entry_to_web_url(entry: dict) -> str | None:
+    """Resolve the watch page URL for a yt-dlp entry, or None if it has no usable id."""
+    web_url = entry.get("webpage_url")
+    if web_url:
+        return web_url
+    url = entry.get("url")
+    if url:
+        if len(url) == 11:
+            return f"https://www.youtube.com/watch?v={url}"
+        return url
+    video_id = entry.get("id")
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return None
+
+
+_AUTOPLAY_LABELS = {
+    AutoplayMode.YOUTUBE: "YouTube",
+    AutoplayMode.CUSTOM: "Custom 1",
+    AutoplayMode.CUSTOM2: "Custom 2",
+}
+
+
+_AUTOPLAY_MODE_BY_CHOICE = {
+    "youtube": AutoplayMode.YOUTUBE,
+    "custom1": AutoplayMode.CUSTOM,
+    "custom2": AutoplayMode.CUSTOM2,
+}
+
+_AUTOPLAY_STATUS = {
+    AutoplayMode.OFF: "Off 🔄",
+    AutoplayMode.YOUTUBE: "YouTube â–¶ï¸",
+    AutoplayMode.CUSTOM: "Custom 1 1ï¸âƒ£",
+    AutoplayMode.CUSTOM2: "Custom 2 2ï¸âƒ£",
+}
+
+_AUTOPLAY_DESCRIPTIONS = {
+    AutoplayMode.OFF: "Autoplay dimatikan.",
+    AutoplayMode.YOUTUBE: "Bot akan memutar rekomendasi dasar dari YouTube saat queue kosong.",
+    AutoplayMode.CUSTOM: "Bot menggunakan smart filtering (Relevan + Eksploratif) saat queue kosong.",
+    AutoplayMode.CUSTOM2: "Bot menggunakan rekomendasi eksploratif yang prioritasnya mencari artis/genre baru.",
+}
+
+# Embeds without per-call inputs, shared by every invocation.
+_EMPTY_PLAYLISTS_EMBED = EmbedBuilder.info(
+    "📂 Playlist Kosong",
+    "Belum ada playlist yang disimpan untuk server ini.\n"
+    "Gunakan `/playlistcopy` untuk menyalin playlist YouTube."
+)
+_ALONE_DISCONNECT_EMBED = EmbedBuilder.info(
+    "👋 Auto Disconnect",
+    "Bot keluar karena sendirian di voice channel."
+)
+
+_LOOP_ICONS = {"off": "ðŸš«", "single": "ðŸ”‚", "queue": "ðŸ”"}
+_LOOP_STATUS = {"off": "ðŸš« Off", "single": "ðŸ”‚ Single", "queue": "ðŸ” Queue"}
+
+
+def _format_player_status(player: MusicPlayer, *, include_queue_size: bool = False) -> str | None:
+    """Build the loop/autoplay status line shared by /queue and /nowplaying."""
+    parts = []
+    if player.loop_mode != LoopMode.OFF:
+        parts.append(f"ðŸ” Loop: **{player.loop_mode}**")
+    label = _AUTOPLAY_LABELS.get(player.autoplay_mode)
+    if label:
+        parts.append(f"🔄 Autoplay: **{label}**")
+    if include_queue_size:
+        parts.append(f"📋 Queue: {player.queue.size} lagu")
+    return " â€¢ ".join(parts) if parts else None
+
+
+def requires_voice(func):
+    """Run the shared voice-channel guards before a Music command body."""
+    @functools.wraps(func)
+    async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+        if not await self._ensure_voice(interaction):
+            return
+        if not await self._ensure_same_channel(interaction):
+            return
+        return await func(self, interaction, *args, **kwargs)
+    return wrapper
+
+
 class Music(commands.Cog):
     """Music commands for Omnia bot."""
 
     CHAT_CLEANUP_DELAY = 20
+    PLAYER_IDLE_TTL = 30 * 60  # Evict unused guild players after 30 minutes
+    PLAYER_EVICT_INTERVAL = 60
+    ALONE_DISCONNECT_DELAY = 10  # Grace period before leaving an empty channel
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.players: dict[int, MusicPlayer] = {}  # guild_id -> MusicPlayer
+        self._last_used: dict[int, float] = {}  # guild_id -> monotonic timestamp
         self._background_tasks: set[asyncio.Task] = set()
+        self._disconnect_tasks: dict[int, asyncio.Task] = {}  # guild_id -> pending alone check
+        # voice channel_id -> non-bot members, maintained from voice state deltas
+        self._human_counts: collections.defaultdict[int, int] = collections.defaultdict(int)
         self._memory_monitor: MemoryMonitor | None = None
         # Shared playlist storage (per guild, shared by all users)
         base_path = Path(__file__).resolve().parent.parent
@@ -44,6 +139,7 @@ class Music(commands.Cog):
         data_path.mkdir(exist_ok=True)
         self.playlists = PlaylistStore(data_path / "playlists.json")
         self.radio_browser = RadioBrowserClient()
+        self._help_embed = self._build_help_embed()
 
     def get_player(self, guild: discord.Guild) -> MusicPlayer:
         """Get or create MusicPlayer for a guild."""
@@ -52,6 +148,7 @@ class Music(commands.Cog):
             player._view_factory = lambda p: NowPlayingView(p)
             player._cleanup_callback = self.cleanup_player
             self.players[guild.id] = player
+        self._last_used[guild.id] = time.monotonic()
         return self.players[guild.id]
 
     def _track_background_task(self, task: asyncio.Task):
@@ -66,20 +163,12 @@ class Music(commands.Cog):
         playlist_title: str | None = None,
     ) -> Track | None:
         """Convert a yt-dlp entry into a Track object."""
-        web_url = entry.get("webpage_url")
+        web_url = _entry_to_web_url(entry)
         if not web_url:
-            if entry.get("url"):
-                if len(entry["url"]) == 11:
-                    web_url = f"https://www.youtube.com/watch?v={entry['url']}"
-                else:
-                    web_url = entry["url"]
-            elif entry.get("id"):
-                web_url = f"https://www.youtube.com/watch?v={entry['id']}"
-            else:
-                return None
+            return None
 
         source_url = "" if playlist_title else entry.get("url", "")
-        if "youtube.com/watch" in source_url or "youtu.be/" in source_url:
+        if source_url and ("youtube.com/watch" in source_url or "youtu.be/" in source_url):
             source_url = ""
 
         return Track(
@@ -172,6 +261,34 @@ class Music(commands.Cog):
         """Remove player for a guild."""
         if guild_id in self.players:
             del self.players[guild_id]
+        self._last_used.pop(guild_id, None)
+
+    def _is_player_idle(self, player: MusicPlayer) -> bool:
+        """Return True when a player holds no playback or voice state worth keeping."""
+        return (
+            not player.is_playing
+            and player.current is None
+            and player.queue.size == 0
+            and player.voice_client is None
+        )
+
+    async def _evict_idle_players(self):
+        """Periodically drop players for guilds that have not used the bot recently."""
+        try:
+            while True:
+                await asyncio.sleep(self.PLAYER_EVICT_INTERVAL)
+                cutoff = time.monotonic() - self.PLAYER_IDLE_TTL
+                for guild_id, last_used in list(self._last_used.items()):
+                    if last_used > cutoff:
+                        continue
+                    player = self.players.get(guild_id)
+                    if player is None:
+                        self._last_used.pop(guild_id, None)
+                    elif self._is_player_idle(player):
+                        logger.debug("Evicting idle player for guild=%s", guild_id)
+                        self.cleanup_player(guild_id)
+        except asyncio.CancelledError:
+            pass
 
     async def _load_radio_stations(self, category_key: str, *, limit: int = RADIO_PAGE_SIZE * 3) -> list[dict]:
         """Load radio stations for a category using Radio Browser."""
@@ -179,6 +296,9 @@ class Music(commands.Cog):
 
     async def cog_load(self):
         """Start optional background services."""
+        self._track_background_task(asyncio.create_task(self._evict_idle_players()))
+        if self.bot.is_ready():
+            self._seed_human_counts()
         if os.getenv("DEBUG_MEMORY", "").strip().lower() in {"1", "true", "yes", "on"}:
             interval = int(os.getenv("DEBUG_MEMORY_INTERVAL", "600"))
             self._memory_monitor = MemoryMonitor(
@@ -202,6 +322,8 @@ class Music(commands.Cog):
         if self._memory_monitor is not None:
             await self._memory_monitor.stop()
             self._memory_monitor = None
+        await close_http_session()
+        await close_lrclib_session()
 
     async def _send_embed(
         self,
@@ -339,7 +461,7 @@ class Music(commands.Cog):
     @app_commands.describe(query="YouTube URL, Playlist URL, atau kata kunci pencarian")
     async def play(self, interaction: discord.Interaction, query: str):
         """Play a track or playlist from YouTube."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         logger.info(f"cmd:play START query='{query}' user={interaction.user.id}")
 
         if not await self._ensure_voice(interaction):
@@ -359,7 +481,7 @@ class Music(commands.Cog):
             )
             return
 
-        t_connect = asyncio.get_event_loop().time()
+        t_connect = time.monotonic()
         logger.info(f"cmd:play CONNECTED took {t_connect - start_time:.2f}s")
 
         try:
@@ -375,7 +497,7 @@ class Music(commands.Cog):
             )
             return
 
-        t_extract = asyncio.get_event_loop().time()
+        t_extract = time.monotonic()
         logger.info(f"cmd:play EXTRACTED took {t_extract - t_connect:.2f}s. Entries: {len(entries)}")
         if entries:
             logger.info(f"First entry URL check: Is stream? {'googlevideo' in str(entries[0].get('url', ''))}")
@@ -423,8 +545,9 @@ class Music(commands.Cog):
         if not player.is_playing:
             if player.current and (not player.voice_client or not player.voice_client.is_connected()):
                 player.current = None
-            # Fire-and-forget so playback begins while we still respond to the user
-            asyncio.create_task(player.ensure_playing())
+            # Fire-and-forget so playback begins while we still respond to the user.
+            # Keep a reference so the task is not garbage-collected mid-flight.
+            self._track_background_task(asyncio.create_task(player.ensure_playing()))
 
         # Start background loading of remaining playlist tracks
         if is_playlist_query:
@@ -440,7 +563,7 @@ class Music(commands.Cog):
             )
             self._track_background_task(task)
 
-        t_process = asyncio.get_event_loop().time()
+        t_process = time.monotonic()
         logger.info(
             "cmd:play QUEUED first track in %.2fs. Playlist background=%s",
             t_process - t_extract,
@@ -469,13 +592,9 @@ class Music(commands.Cog):
     # ─────────────────────── /skip ───────────────────────
 
     @app_commands.command(name="skip", description="Skip lagu yang sedang diputar")
+    @requires_voice
     async def skip(self, interaction: discord.Interaction):
         """Skip the current track."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
 
         if not player.is_playing:
@@ -496,13 +615,9 @@ class Music(commands.Cog):
     @app_commands.describe(
         timestamp="Timestamp tujuan (detik, mm:ss, atau hh:mm:ss)"
     )
+    @requires_voice
     async def seek(self, interaction: discord.Interaction, timestamp: str):
         """Seek to a specific position in the current track."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
 
         if not player.current or not player.is_playing:
@@ -559,13 +674,9 @@ class Music(commands.Cog):
     # ─────────────────────── /stop ───────────────────────
 
     @app_commands.command(name="stop", description="Stop pemutaran dan kosongkan queue")
+    @requires_voice
     async def stop(self, interaction: discord.Interaction):
         """Stop playback and clear queue without leaving voice."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
         await player.stop()
 
@@ -581,13 +692,9 @@ class Music(commands.Cog):
 
     @app_commands.command(name="sleep", description="Atur timer untuk stop dan disconnect otomatis")
     @app_commands.describe(duration="Contoh: 30m, 1h30m, 90s, atau off untuk membatalkan")
+    @requires_voice
     async def sleep(self, interaction: discord.Interaction, duration: str):
         """Set or cancel a sleep timer."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
         seconds = self._parse_duration(duration)
         if seconds is None:
@@ -680,17 +787,9 @@ class Music(commands.Cog):
         embed = EmbedBuilder.queue_list(tracks, player.current, total)
 
         # Add loop and autoplay status
-        status_parts = []
-        if player.loop_mode != LoopMode.OFF:
-            status_parts.append(f"ðŸ” Loop: **{player.loop_mode}**")
-        if player.autoplay_mode == AutoplayMode.YOUTUBE:
-            status_parts.append("🔄 Autoplay: **YouTube**")
-        elif player.autoplay_mode == AutoplayMode.CUSTOM:
-            status_parts.append("🔄 Autoplay: **Custom 1**")
-        elif player.autoplay_mode == AutoplayMode.CUSTOM2:
-            status_parts.append("🔄 Autoplay: **Custom 2**")
-        if status_parts:
-            embed.add_field(name="âš™ï¸ Status", value=" â€¢ ".join(status_parts), inline=False)
+        status = _format_player_status(player)
+        if status:
+            embed.add_field(name="âš™ï¸ Status", value=status, inline=False)
 
         await self._send_embed(interaction, embed)
 
@@ -715,20 +814,8 @@ class Music(commands.Cog):
         )
 
         # Add extra info
-        info_parts = []
-        if player.loop_mode != LoopMode.OFF:
-            info_parts.append(f"ðŸ” Loop: {player.loop_mode}")
-        if player.autoplay_mode != AutoplayMode.OFF:
-            if player.autoplay_mode == AutoplayMode.YOUTUBE:
-                mode_name = "YouTube"
-            elif player.autoplay_mode == AutoplayMode.CUSTOM:
-                mode_name = "Custom 1"
-            else:
-                mode_name = "Custom 2"
-            info_parts.append(f"🔄 Autoplay: {mode_name}")
-        info_parts.append(f"📋 Queue: {player.queue.size} lagu")
-
-        embed.add_field(name="âš™ï¸ Info", value=" â€¢ ".join(info_parts), inline=False)
+        info = _format_player_status(player, include_queue_size=True)
+        embed.add_field(name="âš™ï¸ Info", value=info, inline=False)
 
         await self._send_embed(interaction, embed)
 
@@ -741,11 +828,7 @@ class Music(commands.Cog):
         if not playlists:
             await self._send_embed(
                 interaction,
-                EmbedBuilder.info(
-                    "📂 Playlist Kosong",
-                    "Belum ada playlist yang disimpan untuk server ini.\n"
-                    "Gunakan `/playlistcopy` untuk menyalin playlist YouTube."
-                ),
+                _EMPTY_PLAYLISTS_EMBED,
                 ephemeral=True,
             )
             return
@@ -760,11 +843,7 @@ class Music(commands.Cog):
         playlists = await self.playlists.get_playlists(interaction.guild.id)
         if not playlists:
             await interaction.response.send_message(
-                embed=EmbedBuilder.info(
-                    "📂 Playlist Kosong",
-                    "Belum ada playlist yang disimpan untuk server ini.\n"
-                    "Gunakan `/playlistcopy` untuk menyalin playlist YouTube."
-                ),
+                embed=_EMPTY_PLAYLISTS_EMBED,
                 ephemeral=True,
             )
             return
@@ -780,7 +859,7 @@ class Music(commands.Cog):
         embed = discord.Embed(
             title="📂 Daftar Playlist Server",
             description="\n".join(lines)[:4096],
-            color=discord.Color.from_rgb(138, 43, 226),
+            color=EmbedBuilder.COLOR_PLAYING,
         )
         await self._send_embed(interaction, embed)
 
@@ -793,11 +872,7 @@ class Music(commands.Cog):
         if not playlists:
             await self._send_embed(
                 interaction,
-                EmbedBuilder.info(
-                    "📂 Playlist Kosong",
-                    "Belum ada playlist yang disimpan untuk server ini.\n"
-                    "Gunakan `/playlistcopy` untuk menyalin playlist YouTube."
-                ),
+                _EMPTY_PLAYLISTS_EMBED,
                 ephemeral=True,
             )
             return
@@ -810,13 +885,9 @@ class Music(commands.Cog):
 
     @app_commands.command(name="move", description="Pindahkan lagu di queue ke posisi lain")
     @app_commands.describe(from_pos="Posisi lagu sekarang (angka)", to_pos="Posisi tujuan (angka)")
+    @requires_voice
     async def move(self, interaction: discord.Interaction, from_pos: int, to_pos: int):
         """Move a track in the queue."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
         queue_size = player.queue.size
 
@@ -912,7 +983,7 @@ class Music(commands.Cog):
 
         chunks = split_lyrics(lyrics_text, max_length=4096)
         
-        color = discord.Color.from_rgb(0, 255, 255) if source == 'Lrclib' else discord.Color.from_rgb(255, 255, 100)
+        color = EmbedBuilder.COLOR_LYRICS_SYNCED if source == 'Lrclib' else EmbedBuilder.COLOR_LYRICS
 
         for i, chunk in enumerate(chunks):
             embed = discord.Embed(
@@ -938,7 +1009,7 @@ class Music(commands.Cog):
             msg = await interaction.followup.send(embed=embed, wait=True)
             # Track for auto-delete when song changes
             player = self.get_player(interaction.guild)
-            player.lyrics_messages.append(msg)
+            player.track_lyrics_message(msg)
 
     # ─────────────────────── Playlist Helpers ───────────────────────
 
@@ -984,17 +1055,9 @@ class Music(commands.Cog):
         # Build track list (max 50)
         tracks_data = []
         for entry in entries[: PlaylistStore.MAX_TRACKS]:
-            web_url = entry.get("webpage_url")
+            web_url = _entry_to_web_url(entry)
             if not web_url:
-                if entry.get("url"):
-                    if len(entry["url"]) == 11:
-                        web_url = f"https://www.youtube.com/watch?v={entry['url']}"
-                    else:
-                        web_url = entry["url"]
-                elif entry.get("id"):
-                    web_url = f"https://www.youtube.com/watch?v={entry['id']}"
-                else:
-                    continue
+                continue
 
             tracks_data.append(
                 {
@@ -1058,18 +1121,13 @@ class Music(commands.Cog):
         app_commands.Choice(name="🔂 Single", value="single"),
         app_commands.Choice(name="ðŸ” Queue", value="queue"),
     ])
+    @requires_voice
     async def loop(self, interaction: discord.Interaction, mode: str):
         """Set loop mode."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
         player.loop_mode = mode
 
-        icons = {"off": "ðŸš«", "single": "ðŸ”‚", "queue": "ðŸ”"}
-        icon = icons.get(mode, "")
+        icon = _LOOP_ICONS.get(mode, "")
 
         await self._send_embed(
             interaction,
@@ -1089,31 +1147,14 @@ class Music(commands.Cog):
         app_commands.Choice(name="1ï¸âƒ£ Custom 1", value="custom1"),
         app_commands.Choice(name="2ï¸âƒ£ Custom 2", value="custom2"),
     ])
+    @requires_voice
     async def autoplay(self, interaction: discord.Interaction, mode: str):
         """Set autoplay mode."""
-        if not await self._ensure_voice(interaction):
-            return
-        if not await self._ensure_same_channel(interaction):
-            return
-
         player = self.get_player(interaction.guild)
         
-        if mode == "youtube":
-            player.autoplay_mode = AutoplayMode.YOUTUBE
-            status = "YouTube â–¶ï¸"
-            desc = "Bot akan memutar rekomendasi dasar dari YouTube saat queue kosong."
-        elif mode == "custom1":
-            player.autoplay_mode = AutoplayMode.CUSTOM
-            status = "Custom 1 1ï¸âƒ£"
-            desc = "Bot menggunakan smart filtering (Relevan + Eksploratif) saat queue kosong."
-        elif mode == "custom2":
-            player.autoplay_mode = AutoplayMode.CUSTOM2
-            status = "Custom 2 2ï¸âƒ£"
-            desc = "Bot menggunakan rekomendasi eksploratif yang prioritasnya mencari artis/genre baru."
-        else:
-            player.autoplay_mode = AutoplayMode.OFF
-            status = "Off 🔄"
-            desc = "Autoplay dimatikan."
+        player.autoplay_mode = _AUTOPLAY_MODE_BY_CHOICE.get(mode, AutoplayMode.OFF)
+        status = _AUTOPLAY_STATUS[player.autoplay_mode]
+        desc = _AUTOPLAY_DESCRIPTIONS[player.autoplay_mode]
 
         # Trigger preload check if enabled
         if player.autoplay_mode != AutoplayMode.OFF:
@@ -1129,12 +1170,13 @@ class Music(commands.Cog):
     @app_commands.command(name="status", description="Tampilkan status bot musik")
     async def status(self, interaction: discord.Interaction):
         """Show the bot's current status."""
+        await interaction.response.defer()
         player = self.get_player(interaction.guild)
         vc = interaction.guild.voice_client
 
         embed = discord.Embed(
             title="🤖 Status Bot Musik",
-            color=discord.Color.from_rgb(138, 43, 226)
+            color=EmbedBuilder.COLOR_PLAYING
         )
 
         # Connection status
@@ -1159,12 +1201,9 @@ class Music(commands.Cog):
 
         # Current track
         if player.current:
-            title = player.current.title
-            if len(title) > 40:
-                title = title[:37] + "..."
             embed.add_field(
                 name="🎵 Sedang Diputar",
-                value=f"**[{title}]({player.current.url})** [{player.current.duration_str}]",
+                value=f"**[{player.current.display_title}]({player.current.url})** [{player.current.duration_str}]",
                 inline=False
             )
             progress = player.current_progress_bar() if hasattr(player, "current_progress_bar") else None
@@ -1177,22 +1216,15 @@ class Music(commands.Cog):
         embed.add_field(name="📋 Queue", value=f"{player.queue.size} lagu", inline=True)
 
         # Loop mode
-        loop_icons = {"off": "ðŸš« Off", "single": "ðŸ”‚ Single", "queue": "ðŸ” Queue"}
         embed.add_field(
             name="ðŸ” Loop",
-            value=loop_icons.get(player.loop_mode, player.loop_mode),
+            value=_LOOP_STATUS.get(player.loop_mode, player.loop_mode),
             inline=True
         )
 
         # Autoplay — cycle: Off → YouTube → Custom 1 → Custom 2 → Off
-        ap_status = "Off 🔄"
-        if player.autoplay_mode == AutoplayMode.YOUTUBE:
-            ap_status = "YouTube â–¶ï¸"
-        elif player.autoplay_mode == AutoplayMode.CUSTOM:
-            ap_status = "Custom 1 1ï¸âƒ£"
-        elif player.autoplay_mode == AutoplayMode.CUSTOM2:
-            ap_status = "Custom 2 2ï¸âƒ£"
-            
+        ap_status = _AUTOPLAY_STATUS.get(player.autoplay_mode, _AUTOPLAY_STATUS[AutoplayMode.OFF])
+
         embed.add_field(
             name="🔄 Autoplay",
             value=ap_status,
@@ -1236,10 +1268,15 @@ class Music(commands.Cog):
     @app_commands.command(name="help", description="Tampilkan daftar command bot musik")
     async def help(self, interaction: discord.Interaction):
         """Show all available commands."""
+        await self._send_embed(interaction, self._help_embed)
+
+    @staticmethod
+    def _build_help_embed() -> discord.Embed:
+        """Build the static /help embed (cached on the cog)."""
         embed = discord.Embed(
             title="📖 Daftar Command Omnia Music",
             description="Berikut adalah command yang tersedia:",
-            color=discord.Color.from_rgb(138, 43, 226)
+            color=EmbedBuilder.COLOR_PLAYING
         )
         embed.add_field(name="/play `<query>`", value="Putar lagu dari YouTube (URL, Playlist, atau pencarian)", inline=False)
         embed.add_field(name="/skip", value="Skip lagu yang sedang diputar", inline=False)
@@ -1260,7 +1297,7 @@ class Music(commands.Cog):
         embed.add_field(name="/radio", value="Pilih radio live berdasarkan kategori genre, mood, news, local, dan lainnya", inline=False)
         embed.add_field(name="/help", value="Tampilkan daftar command ini", inline=False)
         embed.set_footer(text="Omnia Music 🎶")
-        await self._send_embed(interaction, embed)
+        return embed
 
     # ─────────────────────── Voice State Listener ───────────────────────
 
@@ -1271,6 +1308,10 @@ class Music(commands.Cog):
         """Handle voice state updates for auto-disconnect and reconnection."""
         # 1. Handle Bot Reconnection
         if member.id == self.bot.user.id:
+            if after.channel is not None and before.channel != after.channel:
+                # Resync the channel the bot now sits in; counts can drift
+                # across missed events (e.g. a gateway RESUME).
+                self._seed_channel_count(after.channel)
             if before.channel is None and after.channel is not None:
                 # Bot joined/reconnected
                 player = self.get_player(member.guild)
@@ -1289,37 +1330,110 @@ class Music(commands.Cog):
         if member.bot:
             return
 
+        if before.channel != after.channel:
+            if before.channel is not None:
+                self._adjust_human_count(before.channel.id, -1)
+            if after.channel is not None:
+                self._adjust_human_count(after.channel.id, 1)
+
         # Check if a user LEFT the bot's voice channel
         if before.channel is not None:
             vc = member.guild.voice_client
             if vc and vc.channel == before.channel:
-                # Count non-bot members
-                human_members = [m for m in before.channel.members if not m.bot]
-                if len(human_members) == 0:
-                    # Bot is alone — wait a moment then disconnect
-                    await asyncio.sleep(10)  # Give 10 seconds grace period
-
-                    # Re-check
-                    if vc.is_connected():
-                        human_members = [m for m in vc.channel.members if not m.bot]
-                        if len(human_members) == 0:
-                            player = self.get_player(member.guild)
-                            if player.text_channel:
-                                embed = EmbedBuilder.info(
-                                    "👋 Auto Disconnect",
-                                    "Bot keluar karena sendirian di voice channel."
-                                )
-                                try:
-                                    await player.text_channel.send(embed=embed, delete_after=20)
-                                except discord.HTTPException:
-                                    pass
-                            await player.disconnect()
-                            self.cleanup_player(member.guild.id)
+                # Cheap counter check here; the deferred check re-counts members
+                if self._human_counts.get(before.channel.id, 0) == 0:
+                    # Bot is alone — check again after a grace period without
+                    # holding up the gateway listener.
+                    self._schedule_disconnect_check(member.guild)
+
+    def _adjust_human_count(self, channel_id: int, delta: int):
+        """Apply a join/leave delta to the cached non-bot member count."""
+        count = self._human_counts[channel_id] + delta
+        if count > 0:
+            self._human_counts[channel_id] = count
+        else:
+            self._human_counts.pop(channel_id, None)
+
+    def _seed_channel_count(self, channel: discord.abc.GuildChannel) -> int:
+        """Recount the non-bot members of one voice channel and store it."""
+        count = sum(1 for m in channel.members if not m.bot)
+        if count:
+            self._human_counts[channel.id] = count
+        else:
+            self._human_counts.pop(channel.id, None)
+        return count
+
+    def _seed_human_counts(self):
+        """Rebuild the non-bot member counts from the current voice channels."""
+        self._human_counts.clear()
+        for guild in self.bot.guilds:
+            for channel in (*guild.voice_channels, *guild.stage_channels):
+                self._seed_channel_count(channel)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Seed voice channel member counts once the guild cache is populated."""
+        self._seed_human_counts()
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        """Reseed counts after a gateway RESUME, since missed voice events fire no on_ready."""
+        self._seed_human_counts()
+
+    def _schedule_disconnect_check(self, guild: discord.Guild):
+        """(Re)schedule the alone-in-channel disconnect check for a guild."""
+        pending = self._disconnect_tasks.get(guild.id)
+        if pending and not pending.done():
+            pending.cancel()
+        task = asyncio.create_task(self._deferred_disconnect_check(guild))
+        self._disconnect_tasks[guild.id] = task
+        self._track_background_task(task)
+
+        def _forget(done: asyncio.Task, gid: int = guild.id):
+            if self._disconnect_tasks.get(gid) is done:
+                del self._disconnect_tasks[gid]
+
+        task.add_done_callback(_forget)
+
+    async def _deferred_disconnect_check(self, guild: discord.Guild):
+        """Disconnect after the grace period if the bot is still alone."""
+        try:
+            await asyncio.sleep(self.ALONE_DISCONNECT_DELAY)
+
+            # Re-check
+            vc = guild.voice_client
+            if not vc or not vc.is_connected():
+                return
+            human_members = [m for m in vc.channel.members if not m.bot]
+            if len(human_members) == 0:
+                player = self.get_player(guild)
+                if player.text_channel:
+                    try:
+                        await player.text_channel.send(embed=_ALONE_DISCONNECT_EMBED, delete_after=20)
+                    except discord.HTTPException:
+                        pass
+                await player.disconnect()
+                self.cleanup_player(guild.id)
+        except asyncio.CancelledError:
+            pass
 
 
 PAGE_SIZE = 25  # Discord select menu limit
 
 
+def _build_playlist_options(playlists: list[dict], start: int) -> list[discord.SelectOption]:
+    """Build one page of select options for saved playlists, starting at `start`."""
+    return [
+        discord.SelectOption(
+            label=truncate(name, 90),
+            value=str(global_idx),
+            description=f"{len(pl.get('tracks') or [])} lagu",
+        )
+        for global_idx, pl in enumerate(playlists[start : start + PAGE_SIZE], start=start)
+        for name in (str(pl.get("name", "Untitled")),)
+    ]
+
+
 class PlaylistSelectView(discord.ui.View):
     """Interactive select menu for choosing a saved playlist, with pagination."""
 
@@ -1345,17 +1459,7 @@ class PlaylistSelectView(discord.ui.View):
         self._update_nav_buttons()
 
     def _build_options(self) -> list[discord.SelectOption]:
-        start = self._current_page * PAGE_SIZE
-        slice_pl = self._all_playlists[start : start + PAGE_SIZE]
-        options = []
-        for i, pl in enumerate(slice_pl):
-            global_idx = start + i
-            name = str(pl.get("name", "Untitled"))
-            track_count = len(pl.get("tracks") or [])
-            label = name if len(name) <= 90 else name[:87] + "..."
-            description = f"{track_count} lagu"
-            options.append(discord.SelectOption(label=label, value=str(global_idx), description=description))
-        return options
+        return _build_playlist_options(self._all_playlists, self._current_page * PAGE_SIZE)
 
     def _update_nav_buttons(self):
         if hasattr(self, "_prev_btn"):
@@ -1378,7 +1482,7 @@ class PlaylistSelectView(discord.ui.View):
         embed = discord.Embed(
             title="📂 Playlist Server",
             description="\n".join(lines) + page_note,
-            color=discord.Color.from_rgb(138, 43, 226),
+            color=EmbedBuilder.COLOR_PLAYING,
         )
         embed.set_footer(text="Pilih playlist dari menu di bawah untuk diputar.")
         return embed
@@ -1471,17 +1575,15 @@ class PlaylistSelectView(discord.ui.View):
             )
             return
 
-        for t in tracks_data:
-            track = Track(
-                source_url="",
-                title=t.get("title", "Unknown"),
-                url=t.get("url", ""),
-                duration=t.get("duration", 0),
-                thumbnail=t.get("thumbnail", ""),
-                uploader=t.get("uploader", "Unknown"),
-                requester=interaction.user,
-            )
-            await player.add_track(track)
+        tracks = [Track.from_dict(t, interaction.user) for t in tracks_data]
+        await player.add_tracks(tracks)
+
+        # Warm stream URLs for the upcoming tracks while playback starts. When
+        # idle, the first track is resolved by play_next itself.
+        warm_start = 0 if player.is_playing else 1
+        warm_tracks = tracks[warm_start : warm_start + MusicPlayer.PLAYLIST_PREFETCH_COUNT]
+        if warm_tracks:
+            music._track_background_task(asyncio.create_task(player.prefetch_tracks(warm_tracks)))
 
         if not player.is_playing:
             if player.current and (not player.voice_client or not player.voice_client.is_connected()):
@@ -1521,17 +1623,7 @@ class PlaylistDeleteView(discord.ui.View):
         self._update_nav_buttons()
 
     def _build_options(self) -> list[discord.SelectOption]:
-        start = self._current_page * PAGE_SIZE
-        slice_pl = self._all_playlists[start : start + PAGE_SIZE]
-        options = []
-        for i, pl in enumerate(slice_pl):
-            global_idx = start + i
-            name = str(pl.get("name", "Untitled"))
-            track_count = len(pl.get("tracks") or [])
-            label = name if len(name) <= 90 else name[:87] + "..."
-            description = f"{track_count} lagu"
-            options.append(discord.SelectOption(label=label, value=str(global_idx), description=description))
-        return options
+        return _build_playlist_options(self._all_playlists, self._current_page * PAGE_SIZE)
 
     def _update_nav_buttons(self):
         if hasattr(self, "_prev_btn"):
@@ -1554,7 +1646,7 @@ class PlaylistDeleteView(discord.ui.View):
         embed = discord.Embed(
             title="ðŸ—‘ï¸ Hapus Playlist Server",
             description="\n".join(lines) + page_note,
-            color=discord.Color.from_rgb(220, 20, 60),
+            color=EmbedBuilder.COLOR_DANGER,
         )
         embed.set_footer(text="Pilih playlist yang ingin dihapus dari menu di bawah.")
         return embed
@@ -1648,23 +1740,6 @@ class RadioCategoryView(discord.ui.View):
         self.guild = guild
         self.user = user
 
-        self.category_select = discord.ui.Select(
-            placeholder="Pilih kategori radio...",
-            min_values=1,
-            max_values=1,
-            options=[
-                discord.SelectOption(
-                    label=cfg["label"],
-                    value=key,
-                    description=cfg["description"],
-                )
-                for key, cfg in RADIO_CATEGORY_PRESETS.items()
-            ],
-            row=0,
-        )
-        self.category_select.callback = self._on_category_select
-        self.add_item(self.category_select)
-
     def build_embed(self) -> discord.Embed:
         lines = [
             "`Genre` untuk pop, rock, jazz, lo-fi, EDM, dan sejenisnya.",
@@ -1676,12 +1751,26 @@ class RadioCategoryView(discord.ui.View):
         embed = discord.Embed(
             title="📻 Radio",
             description="Pilih kategori dulu, lalu pilih stasiun yang ingin diputar.\n\n" + "\n".join(lines),
-            color=discord.Color.from_rgb(138, 43, 226),
+            color=EmbedBuilder.COLOR_PLAYING,
         )
         embed.set_footer(text="Omnia Music 🎶")
         return embed
 
-    async def _on_category_select(self, interaction: discord.Interaction):
+    @discord.ui.select(
+        placeholder="Pilih kategori radio...",
+        min_values=1,
+        max_values=1,
+        options=[
+            discord.SelectOption(
+                label=cfg["label"],
+                value=key,
+                description=cfg["description"],
+            )
+            for key, cfg in RADIO_CATEGORY_PRESETS.items()
+        ],
+        row=0,
+    )
+    async def category_select(self, interaction: discord.Interaction, select: discord.ui.Select):
         if interaction.guild != self.guild:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error("Menu radio ini tidak berlaku di server lain."),
@@ -1692,7 +1781,7 @@ class RadioCategoryView(discord.ui.View):
         if not await self.music_cog._ensure_voice(interaction):
             return
 
-        category_key = self.category_select.values[0] if self.category_select.values else ""
+        category_key = select.values[0] if select.values else ""
         await interaction.response.defer()
 
         stations = await self.music_cog._load_radio_stations(category_key)
@@ -1739,15 +1828,7 @@ class RadioStationView(discord.ui.View):
         self._current_page = 0
         self._total_pages = max(1, (len(self._all_stations) + RADIO_PAGE_SIZE - 1) // RADIO_PAGE_SIZE)
 
-        self.station_select = discord.ui.Select(
-            placeholder="Pilih stasiun radio...",
-            min_values=1,
-            max_values=1,
-            options=self._build_options(),
-            row=0,
-        )
-        self.station_select.callback = self._on_station_select
-        self.add_item(self.station_select)
+        self.station_select.options = self._build_options()
 
         self.prev_button = discord.ui.Button(
             style=discord.ButtonStyle.secondary,
@@ -1781,12 +1862,8 @@ class RadioStationView(discord.ui.View):
         options: list[discord.SelectOption] = []
         for i, station in enumerate(slice_stations):
             global_idx = start + i
-            label = str(station.get("name", "Unknown Station"))
-            if len(label) > 90:
-                label = label[:87] + "..."
-            description = str(station.get("description", "Radio stream"))
-            if len(description) > 100:
-                description = description[:97] + "..."
+            label = truncate(str(station.get("name", "Unknown Station")), 90)
+            description = truncate(str(station.get("description", "Radio stream")), 100)
             options.append(
                 discord.SelectOption(
                     label=label,
@@ -1813,7 +1890,7 @@ class RadioStationView(discord.ui.View):
         embed = discord.Embed(
             title=f"📻 Radio • {self._category_label()}",
             description="\n".join(lines) + page_note,
-            color=discord.Color.from_rgb(30, 144, 255),
+            color=EmbedBuilder.COLOR_QUEUE,
         )
         embed.set_footer(text="Pilih stasiun untuk mulai streaming.")
         return embed
@@ -1839,7 +1916,14 @@ class RadioStationView(discord.ui.View):
             return
         await interaction.response.edit_message(embed=self.parent_view.build_embed(), view=self.parent_view)
 
-    async def _on_station_select(self, interaction: discord.Interaction):
+    @discord.ui.select(
+        placeholder="Pilih stasiun radio...",
+        min_values=1,
+        max_values=1,
+        options=[],
+        row=0,
+    )
+    async def station_select(self, interaction: discord.Interaction, select: discord.ui.Select):
         if interaction.guild != self.guild:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error("Menu radio ini tidak berlaku di server lain."),
@@ -1852,7 +1936,7 @@ class RadioStationView(discord.ui.View):
         if not await self.music_cog._ensure_same_channel(interaction):
             return
 
-        if not self.station_select.values:
+        if not select.values:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error("Tidak ada stasiun yang dipilih."),
                 ephemeral=True,
@@ -1860,7 +1944,7 @@ class RadioStationView(discord.ui.View):
             return
 
         try:
-            global_idx = int(self.station_select.values[0])
+            global_idx = int(select.values[0])
         except ValueError:
             global_idx = -1
 
@@ -6,8 +6,18 @@ Handles playback, queue processing, idle timeout, and autoplay.
 from __future__ import annotations
 
 import asyncio
+import collections
+import datetime
+import functools
+import heapq
 import logging
 import random
+import re
+
+try:
+    from asyncio import timeout as _timeout  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters (shipped with aiohttp)
+    from async_timeout import timeout as _timeout
 
 import discord
 
@@ -18,6 +28,25 @@ from utils.embed_builder import EmbedBuilder
 logger = logging.getLogger('omnia.player')
 
 
+# Substrings marking a playback failure as transient (network/stream hiccups)
+_TEMPORARY_ERROR_RE = re.compile(
+    r"socket|connection|reset|broken pipe|timeout|timed out|503|502|500|403"
+    r"|remote end closed|ffmpeg|http error",
+    re.IGNORECASE,
+)
+
+
+def _message_handle(message: discord.Message) -> discord.PartialMessage | discord.Message:
+    """Reduce a sent message to a PartialMessage (channel + id), dropping its cached payload."""
+    get_partial = getattr(message.channel, "get_partial_message", None)
+    return get_partial(message.id) if get_partial else message
+
+
+def _related_url(entry) -> str:
+    """URL of a get_related() result, which may be a dict or a bare URL."""
+    return entry['url'] if isinstance(entry, dict) else entry
+
+
 class LoopMode:
     OFF = 'off'
     SINGLE = 'single'
@@ -40,12 +69,81 @@ class AutoplayMode:
 class MusicPlayer:
     """Music player instance for a single guild."""
 
+    __slots__ = (
+        "bot",
+        "guild",
+        "queue",
+        "current",
+        "loop_mode",
+        "shuffle_mode",
+        "autoplay_mode",
+        "text_channel",
+        "now_playing_message",
+        "_now_playing_view",
+        "lyrics_messages",
+        "_view_factory",
+        "_cleanup_callback",
+        "_idle_task",
+        "_preload_task",
+        "_next_autoplay",
+        "_playing",
+        "_playback_ended",
+        "_skip_single_loop",
+        "_play_history",
+        "_play_history_set",
+        "_seeking",
+        "_stopping",
+        "_sleep_task",
+        "_sleep_until",
+        "_sleep_label",
+        "_playback_attempts",
+        "_track_started_at",
+        "_track_paused_elapsed",
+        "_progress_task",
+        "_active_source",
+        "_playlist_enqueue_token",
+        "_play_next_lock",
+        "_play_next_running",
+        "_callback_tasks",
+    )
+
     IDLE_TIMEOUT = 180  # 3 minutes
     CHAT_CLEANUP_DELAY = 20
     GAPLESS_WAIT_TIMEOUT = 2.0
     PLAYBACK_RETRY_LIMIT = 2
     FADE_IN_SECONDS = 0.35
     FADE_OUT_SECONDS = 0.8
+    # Fixed output gain, applied inside ffmpeg's filter graph. Sources are
+    # FFmpegOpusAudio, so ffmpeg also does the Opus encoding instead of the voice thread.
+    PLAYBACK_VOLUME = 0.5
+    # ffmpeg arguments shared by every source, assembled once
+    # (minimal probing so the stream starts immediately; only errors on stderr)
+    FFMPEG_BEFORE_OPTIONS = (
+        "-nostdin -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+        " -analyzeduration 0 -probesize 32"
+    )
+    _SEEK_FFMPEG_OPTIONS = f"-vn -loglevel error -af volume={PLAYBACK_VOLUME}"
+    _FFMPEG_FILTER_PREFIX = (
+        f"-vn -loglevel error -af volume={PLAYBACK_VOLUME},afade=t=in:st=0:d={FADE_IN_SECONDS}"
+    )
+    PLAYLIST_PREFETCH_COUNT = 5
+    PRELOAD_DEPTH = 2  # Upcoming queue entries resolved ahead of each track boundary
+    PLAY_HISTORY_LIMIT = 50
+    STOP_WAIT_TIMEOUT = 1.0
+    # Discord's bulk delete accepts at most 100 messages, none older than 14 days
+    BULK_DELETE_LIMIT = 100
+    BULK_DELETE_MAX_AGE = datetime.timedelta(days=13, hours=23)
+
+    # Static notices are built once and reused; sending an embed does not mutate it.
+    _QUEUE_EMPTY_EMBED = EmbedBuilder.info(
+        "⏹️ Pemutaran Selesai",
+        "Queue kosong, tidak ada lagu selanjutnya.\nGunakan `/play` untuk memutar lagu baru."
+    )
+    _IDLE_DISCONNECT_EMBED = EmbedBuilder.info(
+        "⏹️ Auto Disconnect",
+        f"Bot keluar karena idle selama {IDLE_TIMEOUT // 60} menit."
+    )
+    PREFETCH_CONCURRENCY = 3
 
     def __init__(self, bot: discord.Client, guild: discord.Guild):
         self.bot = bot
@@ -56,15 +154,21 @@ class MusicPlayer:
         self.shuffle_mode: int = ShuffleMode.OFF
         self.autoplay_mode: int = AutoplayMode.OFF
         self.text_channel: discord.TextChannel | None = None
-        self.now_playing_message: discord.Message | None = None
+        # Stored as PartialMessage handles: edits and deletes only need the channel + id
+        self.now_playing_message: discord.PartialMessage | None = None
         self._now_playing_view = None
-        self.lyrics_messages: list[discord.Message] = []  # Track lyrics messages for cleanup
+        self.lyrics_messages: list[discord.PartialMessage] = []  # Track lyrics messages for cleanup
         self._view_factory = None  # Callback to create NowPlayingView
+        self._cleanup_callback = None  # Set by the cog to release this player
         self._idle_task: asyncio.Task | None = None
         self._preload_task: asyncio.Task | None = None
         self._next_autoplay: Track | None = None
         self._playing = asyncio.Event()
-        self._play_history: list[str] = []  # Track URLs that have been played
+        self._playback_ended = asyncio.Event()  # Set once the active source's after-callback fires
+        self._skip_single_loop = False  # One-shot: /skip bypasses the single-track loop
+        # Track URLs that have been played (ordered, capped) plus a set for O(1) lookups
+        self._play_history: collections.deque[str] = collections.deque(maxlen=self.PLAY_HISTORY_LIMIT)
+        self._play_history_set: set[str] = set()
         self._seeking = False  # True while replacing source for seek (ignore after_play from old source)
         self._stopping = False  # True while a manual stop is draining the current source
         self._sleep_task: asyncio.Task | None = None
@@ -77,6 +181,8 @@ class MusicPlayer:
         self._active_source: discord.AudioSource | None = None
         self._playlist_enqueue_token = 0
         self._play_next_lock = asyncio.Lock()
+        self._play_next_running = False
+        self._callback_tasks: set[asyncio.Task] = set()
 
     @property
     def voice_client(self) -> discord.VoiceClient | None:
@@ -188,40 +294,31 @@ class MusicPlayer:
                 source_url = data["url"]
                 self.current.source_url = source_url
             except Exception as e:
-                logger.error(f"Seek: failed to resolve stream URL: {e}")
+                logger.error("Seek: failed to resolve stream URL: %s", e)
                 return False
 
         # Prepare new source starting from the requested position
-        ffmpeg_before = (
-            f"-ss {int(position)} "
-            "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
-        )
-
-        def after_play(error):
-            if error:
-                logger.error(f"Player error after seek: {error}")
-            asyncio.run_coroutine_threadsafe(self.play_next(), self.bot.loop)
+        ffmpeg_before = f"-ss {int(position)} {self.FFMPEG_BEFORE_OPTIONS}"
 
         try:
             if vc.is_playing() or vc.is_paused():
                 self._seeking = True
                 self._cleanup_active_source()
-                vc.stop()
-                await asyncio.sleep(0.3)
+                await self._stop_and_wait(vc)
 
-            source = discord.FFmpegPCMAudio(
+            source = discord.FFmpegOpusAudio(
                 source_url,
                 before_options=ffmpeg_before,
-                options="-vn",
+                options=self._SEEK_FFMPEG_OPTIONS,
             )
-            source = discord.PCMVolumeTransformer(source, volume=0.5)
             self._track_started_at = asyncio.get_event_loop().time() - position
             self._track_paused_elapsed = None
             self._active_source = source
-            vc.play(source, after=after_play)
+            self._playback_ended.clear()
+            vc.play(source, after=functools.partial(self._after_play, None))
             return True
         except Exception as e:
-            logger.error(f"Seek: error while starting playback at {position}s: {e}")
+            logger.error("Seek: error while starting playback at %ss: %s", position, e)
             return False
 
     async def connect(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
@@ -251,25 +348,28 @@ class MusicPlayer:
             except Exception:
                 pass
             self._now_playing_view = None
-        
-        # Ensure buttons are removed
-        await self._disable_now_playing_buttons()
-        
+
+        # Remove buttons, leave voice and clear the queue concurrently; none
+        # of these depend on each other.
+        cleanup = [self._disable_now_playing_buttons(), self.queue.clear()]
         vc = self.voice_client
         if vc and vc.is_connected():
             if vc.is_playing() or vc.is_paused():
                 self._cleanup_active_source()
                 vc.stop()
-            await vc.disconnect()
+            cleanup.append(vc.disconnect())
+        for result in await asyncio.gather(*cleanup, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning("Disconnect cleanup step failed: %s", result)
+
         self.current = None
         self._track_started_at = None
         self._track_paused_elapsed = None
         self._cleanup_active_source()
-        await self.queue.clear()
-        self._play_history.clear()
+        self._clear_play_history()
         self._playback_attempts.clear()
         self._next_autoplay = None
-        cleanup_callback = getattr(self, "_cleanup_callback", None)
+        cleanup_callback = self._cleanup_callback
         if callable(cleanup_callback):
             try:
                 cleanup_callback(self.guild.id)
@@ -327,7 +427,7 @@ class MusicPlayer:
                 except (discord.HTTPException, discord.NotFound):
                     return
                 except Exception as e:
-                    logger.debug(f"Progress updater failed: {e}")
+                    logger.debug("Progress updater failed: %s", e)
                     return
         except asyncio.CancelledError:
             pass
@@ -367,13 +467,43 @@ class MusicPlayer:
         position = await self.queue.add(track)
         return position
 
+    async def add_tracks(self, tracks: list[Track]) -> int:
+        """Add several tracks to the queue at once. Returns the new queue size."""
+        return await self.queue.add_many(tracks)
+
+    async def prefetch_tracks(self, tracks: list[Track]):
+        """Resolve stream URLs for upcoming tracks ahead of playback."""
+        semaphore = asyncio.Semaphore(self.PREFETCH_CONCURRENCY)
+
+        async def _resolve(track: Track):
+            if track.source_url or not track.url:
+                return
+            async with semaphore:
+                if track.source_url:
+                    return
+                try:
+                    data = await YTDLSource.get_stream_data(
+                        track.url,
+                        loop=self.bot.loop,
+                        title_hint=track.title,
+                        uploader_hint=track.uploader,
+                        background=True,
+                    )
+                except Exception as e:
+                    logger.debug("Prefetch failed for %s: %s", track.title, e)
+                    return
+            if data and data.get('url') and not track.source_url:
+                track.source_url = data['url']
+
+        await asyncio.gather(*(_resolve(track) for track in tracks))
+
     async def ensure_playing(self):
         """Start playback if idle and there is something queued."""
-        if self.is_playing or getattr(self, '_play_next_running', False):
+        if self.is_playing or self._play_next_running:
             return
 
         async with self._play_next_lock:
-            if self.is_playing or getattr(self, '_play_next_running', False) or self.queue.size == 0:
+            if self.is_playing or self._play_next_running or self.queue.size == 0:
                 return
             await self.play_next()
 
@@ -442,7 +572,7 @@ class MusicPlayer:
 
     async def play_next(self):
         """Play the next track in the queue."""
-        if getattr(self, '_play_next_running', False):
+        if self._play_next_running:
             return
             
         self._play_next_running = True
@@ -453,12 +583,12 @@ class MusicPlayer:
 
     async def _do_play_next(self):
         # If we're in the middle of a seek, the old source's after_play fired — ignore it
-        if getattr(self, '_seeking', False):
+        if self._seeking:
             self._seeking = False
             return
 
         # Manual stop should not behave like a natural track end.
-        if getattr(self, '_stopping', False):
+        if self._stopping:
             self._stopping = False
             self._cancel_idle_timer()
             self._cancel_preload()
@@ -493,7 +623,7 @@ class MusicPlayer:
                          self._start_idle_timer()
                          return
                 except Exception as e:
-                     logger.error(f"Failed to auto-reconnect: {e}")
+                     logger.error("Failed to auto-reconnect: %s", e)
                      self.current = None
                      self._reset_track_progress()
                      self._cancel_progress_updater()
@@ -512,7 +642,9 @@ class MusicPlayer:
                 return
 
         # Handle loop modes
-        if self.current and self.loop_mode == LoopMode.SINGLE:
+        skip_single_loop = self._skip_single_loop
+        self._skip_single_loop = False
+        if self.current and self.loop_mode == LoopMode.SINGLE and not skip_single_loop:
             # Re-queue the same track at the front
             await self.queue.put_front(self.current)
         elif self.current and self.loop_mode == LoopMode.QUEUE:
@@ -563,12 +695,10 @@ class MusicPlayer:
 
                 # Send queue empty notification
                 if self.text_channel:
-                    embed = EmbedBuilder.info(
-                        "⏹️ Pemutaran Selesai",
-                        "Queue kosong, tidak ada lagu selanjutnya.\nGunakan `/play` untuk memutar lagu baru."
-                    )
                     try:
-                        await self.text_channel.send(embed=embed, delete_after=self.CHAT_CLEANUP_DELAY)
+                        await self.text_channel.send(
+                            embed=self._QUEUE_EMPTY_EMBED, delete_after=self.CHAT_CLEANUP_DELAY
+                        )
                     except discord.HTTPException:
                         pass
                 return
@@ -576,56 +706,46 @@ class MusicPlayer:
         self.current = next_track
         # Track play history for autoplay deduplication
         if next_track.url:
-            self._play_history.append(next_track.url)
-            # Keep history capped at 50
-            if len(self._play_history) > 50:
-                self._play_history = self._play_history[-50:]
+            self._remember_played(next_track.url)
 
         # Wait for any pending pre-load to finish
         if self._preload_task and not self._preload_task.done():
             try:
                 # Keep the wait short so the next track starts with minimal gap.
                 logger.info("Waiting for pre-load to complete...")
-                await asyncio.wait_for(self._preload_task, timeout=self.GAPLESS_WAIT_TIMEOUT)
+                # Shielded: on timeout the preload keeps running and stays owned by _cancel_preload.
+                async with _timeout(self.GAPLESS_WAIT_TIMEOUT):
+                    await asyncio.shield(self._preload_task)
             except Exception as e:
-                logger.warning(f"Waited for pre-load but it failed/timed out: {e}")
+                logger.warning("Waited for pre-load but it failed/timed out: %s", e)
 
         try:
             # Create audio source — reuse source_url if already extracted
             if next_track.source_url:
-                logger.info(f"Using pre-loaded URL for: {next_track.title}")
-                source = discord.FFmpegPCMAudio(
-                    next_track.source_url,
-                    **self._build_ffmpeg_options(next_track)
-                )
-                source = discord.PCMVolumeTransformer(source, volume=0.5)
+                logger.info("Using pre-loaded URL for: %s", next_track.title)
             else:
-                source, _ = await YTDLSource.from_url(
+                data = await YTDLSource.get_stream_data(
                     next_track.url,
                     loop=self.bot.loop,
                     title_hint=next_track.title,
                     uploader_hint=next_track.uploader,
-                    ffmpeg_options=self._build_ffmpeg_options(next_track),
                 )
-
-            def after_play(error):
-                if error:
-                    logger.error(f'Player error: {error}')
-                    asyncio.run_coroutine_threadsafe(
-                        self._recover_from_playback_error(next_track, error),
-                        self.bot.loop,
-                    )
-                    return
-                asyncio.run_coroutine_threadsafe(self.play_next(), self.bot.loop)
+                if not data.get("url"):
+                    raise ValueError("Gagal mendapatkan URL audio.")
+                next_track.source_url = data["url"]
+            source = discord.FFmpegOpusAudio(
+                next_track.source_url,
+                **self._build_ffmpeg_options(next_track)
+            )
 
             # Stop if somehow already playing
             if vc.is_playing() or vc.is_paused():
                 self._cleanup_active_source()
-                vc.stop()
-                await asyncio.sleep(0.5)
+                await self._stop_and_wait(vc)
 
             self._active_source = source
-            vc.play(source, after=after_play)
+            self._playback_ended.clear()
+            vc.play(source, after=functools.partial(self._after_play, next_track))
             self._playback_attempts.pop(self._track_key(next_track), None)
             self._set_track_start(0)
 
@@ -633,7 +753,7 @@ class MusicPlayer:
             self._schedule_preload()
 
         except Exception as e:
-            logger.error(f'Error playing track: {e}')
+            logger.error('Error playing track: %s', e)
             if self.text_channel:
                 message = f"Gagal memutar: **{next_track.title}**\n`{e}`"
                 if self._is_temporary_playback_error(e):
@@ -648,6 +768,8 @@ class MusicPlayer:
             attempts = self._playback_attempts.get(key, 0)
             if self._is_temporary_playback_error(e) and attempts < self.PLAYBACK_RETRY_LIMIT:
                 self._playback_attempts[key] = attempts + 1
+                # The resolved URL may be the dead one (403, expired signature)
+                self._forget_stream_url(next_track)
                 await self.queue.put_front(next_track)
                 self.current = None
                 try:
@@ -663,31 +785,88 @@ class MusicPlayer:
 
         # Send embed OUTSIDE the try block — embed errors won't trigger play_next
         try:
-            await self._disable_now_playing_buttons()
-            if self.text_channel:
-                embed = self._build_now_playing_embed()
-                view = self._get_now_playing_view()
-                if embed:
-                    self.now_playing_message = await self.text_channel.send(
-                        embed=embed, view=view
-                    )
-                    self._start_progress_updater()
+            embed = self._build_now_playing_embed() if self.text_channel else None
+            if embed:
+                await self._publish_now_playing(embed)
+                self._start_progress_updater()
+            else:
+                await self._disable_now_playing_buttons()
         except Exception as e:
-            logger.warning(f'Error sending now playing embed: {e}')
+            logger.warning('Error sending now playing embed: %s', e)
+
+    def _after_play(self, track: Track | None, error: Exception | None):
+        """Voice-thread callback fired when a source finishes or fails."""
+        self.bot.loop.call_soon_threadsafe(self._playback_ended.set)
+        if error:
+            logger.error('Player error: %s', error)
+            if track is not None:
+                self.bot.loop.call_soon_threadsafe(
+                    self._spawn_callback_task, self._recover_from_playback_error(track, error)
+                )
+                return
+        self.bot.loop.call_soon_threadsafe(self._spawn_callback_task, self.play_next())
+
+    def _spawn_callback_task(self, coro):
+        """Run a coroutine scheduled from the voice thread, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._callback_tasks.discard)
 
     async def skip(self):
         """Skip the current track."""
         vc = self.voice_client
         if vc and (vc.is_playing() or vc.is_paused()):
-            # Temporarily disable single loop for skip
-            old_loop = self.loop_mode
-            if self.loop_mode == LoopMode.SINGLE:
-                self.loop_mode = LoopMode.OFF
+            # Let play_next move past the current track even in single loop
+            self._skip_single_loop = self.loop_mode == LoopMode.SINGLE
             vc.stop()  # This triggers after_play → play_next
-            # Restore loop mode after a brief delay
-            if old_loop == LoopMode.SINGLE:
-                await asyncio.sleep(0.5)
-                self.loop_mode = old_loop
+
+    async def _stop_and_wait(self, vc: discord.VoiceClient):
+        """Stop the active source and wait (briefly) for its after-callback to fire."""
+        vc.stop()
+        try:
+            async with _timeout(self.STOP_WAIT_TIMEOUT):
+                await self._playback_ended.wait()
+        except asyncio.TimeoutError:
+            pass
+
+    async def _publish_now_playing(self, embed: discord.Embed):
+        """Show the Now Playing embed, editing the previous message in place when possible."""
+        self._cancel_progress_updater()
+        if self._now_playing_view:
+            self._now_playing_view.stop()
+            self._now_playing_view = None
+        # Fresh view so per-track button state (e.g. lyrics) resets
+        view = self._get_now_playing_view()
+
+        message = self.now_playing_message
+        stale = list(self.lyrics_messages)
+        self.lyrics_messages.clear()
+        if message and message.channel.id == self.text_channel.id:
+            try:
+                await asyncio.gather(
+                    message.edit(embed=embed, view=view),
+                    self._delete_messages(stale),
+                )
+                return
+            except discord.NotFound:
+                stale = []
+            except discord.HTTPException as e:
+                # Rate limit, 5xx, archived thread...: fall back to a fresh
+                # message and try to remove the one we couldn't edit.
+                logger.debug("Now Playing edit failed, sending a new message: %s", e)
+                stale = [message]
+        elif message:
+            stale.append(message)
+
+        self.now_playing_message = None
+        await self._delete_messages(stale)
+        self.now_playing_message = _message_handle(
+            await self.text_channel.send(embed=embed, view=view)
+        )
+
+    def track_lyrics_message(self, message: discord.Message):
+        """Remember a lyrics message so it is deleted when the track changes."""
+        self.lyrics_messages.append(_message_handle(message))
 
     async def _disable_now_playing_buttons(self):
         """Delete the current Now Playing message and lyrics messages."""
@@ -699,24 +878,43 @@ class MusicPlayer:
                 pass
             self._now_playing_view = None
 
-        # Delete lyrics messages first
-        await self._delete_lyrics_messages()
-        
+        # Delete lyrics messages and the Now Playing message in one round of requests
+        messages = list(self.lyrics_messages)
+        self.lyrics_messages.clear()
         if self.now_playing_message:
-            try:
-                await self.now_playing_message.delete()
-            except (discord.HTTPException, Exception):
-                pass
+            messages.append(self.now_playing_message)
             self.now_playing_message = None
+        await self._delete_messages(messages)
 
-    async def _delete_lyrics_messages(self):
-        """Delete all tracked lyrics messages."""
-        for msg in self.lyrics_messages:
-            try:
-                await msg.delete()
-            except (discord.HTTPException, Exception):
-                pass
-        self.lyrics_messages.clear()
+    @classmethod
+    async def _delete_messages(cls, messages: list[discord.PartialMessage]):
+        """Delete messages concurrently (one bulk call per channel when allowed), ignoring ones already gone."""
+        if not messages:
+            return
+        by_channel: dict[int, list[discord.PartialMessage]] = {}
+        for msg in messages:
+            by_channel.setdefault(msg.channel.id, []).append(msg)
+        await asyncio.gather(
+            *(cls._delete_channel_messages(group) for group in by_channel.values()),
+            return_exceptions=True,
+        )
+
+    @classmethod
+    async def _delete_channel_messages(cls, messages: list[discord.PartialMessage]):
+        """Delete messages from one channel, bulk-deleting when Discord allows it."""
+        channel = messages[0].channel
+        if 2 <= len(messages) <= cls.BULK_DELETE_LIMIT and isinstance(channel, discord.TextChannel):
+            cutoff = discord.utils.utcnow() - cls.BULK_DELETE_MAX_AGE
+            if (
+                channel.permissions_for(channel.guild.me).manage_messages
+                and all(msg.created_at > cutoff for msg in messages)
+            ):
+                try:
+                    await channel.delete_messages(messages)
+                    return
+                except discord.HTTPException:
+                    pass  # Fall back to individual deletes
+        await asyncio.gather(*(msg.delete() for msg in messages), return_exceptions=True)
 
     async def stop(self):
         """Stop playback and clear queue."""
@@ -729,8 +927,9 @@ class MusicPlayer:
         self.current = None
         self.loop_mode = LoopMode.OFF
         self.shuffle_mode = ShuffleMode.OFF
-        self._play_history.clear()
+        self._clear_play_history()
         self._playback_attempts.clear()
+        self._skip_single_loop = False
         self._next_autoplay = None
         self._reset_track_progress()
         await self.cancel_sleep_timer()
@@ -747,42 +946,51 @@ class MusicPlayer:
             await asyncio.sleep(0)
             self._cleanup_active_source()
 
+    def _remember_played(self, url: str):
+        """Record a played URL, evicting the oldest entry once the history is full."""
+        history = self._play_history
+        if len(history) == history.maxlen:
+            evicted = history[0]
+            history.append(url)
+            # The same URL can appear more than once (e.g. loop single)
+            if evicted not in history:
+                self._play_history_set.discard(evicted)
+        else:
+            history.append(url)
+        self._play_history_set.add(url)
+
+    def _clear_play_history(self):
+        """Forget all played URLs."""
+        self._play_history.clear()
+        self._play_history_set.clear()
+
     def _track_key(self, track: Track | None) -> str:
         """Build a stable key for retry bookkeeping."""
         if not track:
             return ""
         return track.url or track.source_url or track.title
 
+    def _forget_stream_url(self, track: Track):
+        """Drop a track's resolved stream URL (and its cache entry) so it is re-extracted."""
+        # Radio and direct streams have no page URL to re-resolve from
+        if track.url:
+            track.source_url = ""
+            YTDLSource.invalidate_stream(track.url)
+
     def _build_ffmpeg_options(self, track: Track) -> dict[str, str]:
-        """Build ffmpeg options with gentle fades for smoother transitions."""
-        filters = [f"afade=t=in:st=0:d={self.FADE_IN_SECONDS}"]
+        """Build ffmpeg options with gentle fades and the fixed output volume."""
+        options = self._FFMPEG_FILTER_PREFIX
         if track.duration and track.duration > int(self.FADE_OUT_SECONDS) + 1:
             fade_start = max(track.duration - self.FADE_OUT_SECONDS, 0)
-            filters.append(f"afade=t=out:st={fade_start}:d={self.FADE_OUT_SECONDS}")
+            options += f",afade=t=out:st={fade_start}:d={self.FADE_OUT_SECONDS}"
         return {
-            "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
-            "options": "-vn -af " + ",".join(filters),
+            "before_options": self.FFMPEG_BEFORE_OPTIONS,
+            "options": options,
         }
 
     def _is_temporary_playback_error(self, error: Exception | str) -> bool:
         """Classify playback failures that should be retried."""
-        message = str(error).lower()
-        tokens = (
-            "socket",
-            "connection",
-            "reset",
-            "broken pipe",
-            "timeout",
-            "timed out",
-            "503",
-            "502",
-            "500",
-            "403",
-            "remote end closed",
-            "ffmpeg",
-            "http error",
-        )
-        return any(token in message for token in tokens)
+        return _TEMPORARY_ERROR_RE.search(str(error)) is not None
 
     async def _recover_from_playback_error(self, track: Track, error: Exception | str):
         """Retry the current track after a temporary failure."""
@@ -790,7 +998,7 @@ class MusicPlayer:
         attempts = self._playback_attempts.get(key, 0)
 
         if attempts >= self.PLAYBACK_RETRY_LIMIT:
-            logger.warning(f"Playback retries exhausted for {track.title}")
+            logger.warning("Playback retries exhausted for %s", track.title)
             self._playback_attempts.pop(key, None)
             self.current = None
             await self.play_next()
@@ -811,6 +1019,8 @@ class MusicPlayer:
 
         await asyncio.sleep(2 ** attempts)
 
+        # Re-resolve on retry instead of replaying the URL that just failed
+        self._forget_stream_url(track)
         await self.queue.put_front(track)
         self.current = None
 
@@ -835,7 +1045,7 @@ class MusicPlayer:
             return None
 
         try:
-            logger.info(f'Autoplay: searching related for "{self.current.title}" (Mode: {self.autoplay_mode})')
+            logger.info('Autoplay: searching related for "%s" (Mode: %s)', self.current.title, self.autoplay_mode)
 
             query_url = self.current.url
             
@@ -853,53 +1063,65 @@ class MusicPlayer:
                 return None
 
             # Filter out songs that have already been played
-            fresh = [
-                r for r in related
-                if (r['url'] if isinstance(r, dict) else r) not in self._play_history
-            ]
+            played = self._play_history_set
+            fresh = [r for r in related if _related_url(r) not in played]
 
             if not fresh:
                 logger.info('Autoplay: all related tracks already played, using full list')
                 fresh = related  # Fallback if everything was played
 
             if self.autoplay_mode in (AutoplayMode.CUSTOM, AutoplayMode.CUSTOM2):
-                # Custom scoring (Explorative + Related) without cover/live penalty
+                # Custom scoring (Explorative + Related) without cover/live penalty.
+                # Everything derived from the current track is computed once, not per candidate.
+                current_uploader = (self.current.uploader or "").lower()
+                check_uploader = len(current_uploader) > 2
+                current_words = tuple(w for w in self.current.title.lower().split() if len(w) > 3)
+                # Explorative (Custom 2) penalizes exact word matches, Custom rewards them
+                word_weight = -2 if self.autoplay_mode == AutoplayMode.CUSTOM2 else 2
+
                 def score_video(video):
                     score = random.uniform(0, 10) # Explorative randomness
                     title = video.get('title', '').lower()
-                    
+
                     # Boost for related artist
-                    current_uploader = self.current.uploader.lower() if self.current.uploader else ""
-                    if current_uploader and len(current_uploader) > 2 and current_uploader in title:
-                         score += 5
-                         
+                    if check_uploader and current_uploader in title:
+                        score += 5
+
                     # Boost/Penalty for related words
-                    current_words = [w for w in self.current.title.lower().split() if len(w) > 3]
-                    match_count = sum(1 for w in current_words if w in title)
-                    if self.autoplay_mode == AutoplayMode.CUSTOM2:
-                        score -= match_count * 2  # Explorative: penalize exact matches
-                    else:
-                        score += match_count * 2
-                    
+                    score += word_weight * sum(1 for w in current_words if w in title)
                     return score
 
-                fresh.sort(key=score_video, reverse=True)
                 # Pick randomly from the top candidates
                 num_candidates = 10 if self.autoplay_mode == AutoplayMode.CUSTOM2 else 3
-                candidates = fresh[:num_candidates]
+                candidates = heapq.nlargest(num_candidates, fresh, key=score_video)
                 chosen = random.choice(candidates)
-                mode_name = "Custom 2" if self.autoplay_mode == AutoplayMode.CUSTOM2 else "Custom"
-                logger.info(f'Autoplay ({mode_name}): Top candidates -> {[c.get("title") for c in candidates]}')
+                if logger.isEnabledFor(logging.INFO):
+                    mode_name = "Custom 2" if self.autoplay_mode == AutoplayMode.CUSTOM2 else "Custom"
+                    logger.info('Autoplay (%s): Top candidates -> %s', mode_name, [c.get("title") for c in candidates])
             else:
                 # Pick a random one from the filtered results (original pure YouTube mode)
                 chosen = random.choice(fresh)
 
-            chosen_url = chosen['url'] if isinstance(chosen, dict) else chosen
-
-            logger.info(f'Autoplay: chose "{chosen.get("title", chosen_url) if isinstance(chosen, dict) else chosen_url}"')
+            chosen_url = _related_url(chosen)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('Autoplay: chose "%s"', chosen.get("title", chosen_url) if isinstance(chosen, dict) else chosen_url)
+
+            # Flat related entries usually carry enough metadata for the embed; the
+            # stream URL is then resolved by the preload or by play_next itself.
+            if isinstance(chosen, dict) and chosen.get('duration') and chosen.get('title') not in (None, '', 'Unknown', chosen_url):
+                return Track(
+                    source_url='',
+                    title=chosen['title'],
+                    url=chosen_url,
+                    duration=chosen['duration'],
+                    thumbnail=chosen.get('thumbnail', ''),
+                    uploader=chosen.get('uploader') or 'Unknown',
+                    requester=self.bot.user  # Autoplay = requested by bot
+                )
 
-            # Extract full info for playback
-            _, data = await YTDLSource.from_url(chosen_url, loop=self.bot.loop)
+            # Otherwise extract full info (stream data only; no audio source needed yet)
+            data = await YTDLSource.get_stream_data(chosen_url, loop=self.bot.loop)
 
             track = Track(
                 source_url=data.get('url', ''),
@@ -914,7 +1136,7 @@ class MusicPlayer:
             return track
 
         except Exception as e:
-            logger.error(f'Autoplay error: {e}')
+            logger.error('Autoplay error: %s', e)
             return None
 
     def _start_idle_timer(self):
@@ -938,12 +1160,10 @@ class MusicPlayer:
                 await self._disable_now_playing_buttons()
 
                 if self.text_channel:
-                    embed = EmbedBuilder.info(
-                        "⏹️ Auto Disconnect",
-                        f"Bot keluar karena idle selama {self.IDLE_TIMEOUT // 60} menit."
-                    )
                     try:
-                        await self.text_channel.send(embed=embed, delete_after=self.CHAT_CLEANUP_DELAY)
+                        await self.text_channel.send(
+                            embed=self._IDLE_DISCONNECT_EMBED, delete_after=self.CHAT_CLEANUP_DELAY
+                        )
                     except discord.HTTPException:
                         pass
                 await self.disconnect()
@@ -959,10 +1179,23 @@ class MusicPlayer:
         """
         if self.queue.size == 0 and self.current and self.autoplay_mode != AutoplayMode.OFF:
             logger.info("Autoplay toggled ON: Triggering immediate preload...")
-            self._schedule_preload()
+            self._schedule_preload(force=True)
 
-    def _schedule_preload(self):
-        """Schedule pre-loading of the next track."""
+    def _schedule_preload(self, *, force: bool = False):
+        """
+        Schedule pre-loading of the upcoming tracks.
+        Skipped when a preload is already running or there is nothing left to
+        resolve; `force` restarts it after an explicit change (e.g. autoplay toggle).
+        """
+        if not force:
+            if self._preload_task and not self._preload_task.done():
+                return
+            upcoming = self.queue.as_list(self.PRELOAD_DEPTH)
+            if upcoming:
+                if all(track.source_url for track in upcoming):
+                    return
+            elif self.autoplay_mode == AutoplayMode.OFF or self._next_autoplay:
+                return
         self._cancel_preload()
         self._preload_task = asyncio.create_task(self._preload_next_track())
 
@@ -988,46 +1221,49 @@ class MusicPlayer:
 
     async def _preload_next_track(self):
         """
-        Pre-resolve the URL for the next track in the queue.
-        This ensures 'skip' and auto-play are instant.
+        Pre-resolve the URLs for the next PRELOAD_DEPTH tracks in the queue.
+        This ensures 'skip' (even a few in a row) and auto-play are instant.
         """
         try:
             # Wait a bit to let the current playback stabilize
             # Reduced to 1s to ensure it's ready before the song ends (short songs)
             await asyncio.sleep(1)
             
-            # Peek at next track
-            next_track = await self.queue.peek_next()
-            if not next_track:
+            # Peek at the upcoming tracks
+            upcoming = self.queue.as_list(self.PRELOAD_DEPTH)
+            if not upcoming:
                 # Queue is empty. If autoplay is ON, pre-fetch the recommendation!
                 if self.autoplay_mode != AutoplayMode.OFF and self.current and not self._next_autoplay:
                      try:
-                        logger.info(f"Pre-loading autoplay for: {self.current.title}")
-                        # _get_autoplay_track returns a full Track object with source_url already resolved
+                        logger.info("Pre-loading autoplay for: %s", self.current.title)
                         track = await self._get_autoplay_track()
                         if track:
+                            if not track.source_url:
+                                await self.prefetch_tracks([track])
                             self._next_autoplay = track
-                            logger.info(f"Pre-loaded autoplay track: {track.title}")
+                            logger.info("Pre-loaded autoplay track: %s", track.title)
                      except Exception as e:
-                        logger.warning(f"Autoplay pre-load failed: {e}")
+                        logger.warning("Autoplay pre-load failed: %s", e)
                 return
 
             # Clear stale autoplay if queue is not empty (user added song)
             if self._next_autoplay:
                 self._next_autoplay = None
 
-            if next_track.source_url:
+            unresolved = [track for track in upcoming if not track.source_url]
+            if not unresolved:
                 # Already resolved
                 return
 
-            logger.info(f"Pre-loading next track: {next_track.title}")
-            data = await YTDLSource.get_stream_data(next_track.url, loop=self.bot.loop)
-            
-            if data and data.get('url'):
-                next_track.source_url = data['url']
-                logger.info(f"Pre-loaded successfully: {next_track.title}")
+            logger.info("Pre-loading next track(s): %s", ", ".join(t.title for t in unresolved))
+            await self.prefetch_tracks(unresolved)
+            logger.info(
+                "Pre-loaded %d/%d track(s)",
+                sum(1 for t in unresolved if t.source_url),
+                len(unresolved),
+            )
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.warning(f"Pre-load failed: {e}")
+            logger.warning("Pre-load failed: %s", e)
@@ -5,39 +5,53 @@ QueueManager — Async queue wrapper for music tracks.
 from __future__ import annotations
 
 import asyncio
+import random
+from collections import deque
+from itertools import islice, zip_longest
 from typing import Optional
 from core.ytdl_source import Track
 
+_RIFFLE_GAP = object()  # zip_longest filler for the shorter riffle half
+
 
 class QueueManager:
     """Thread-safe async queue for managing music tracks."""
 
     def __init__(self):
-        self._queue: list[Track] = []
+        self._queue: deque[Track] = deque()
         self._lock = asyncio.Lock()
         self._counter = 0
 
+    # Single deque operations below run without awaiting, so they cannot interleave
+    # with other coroutines and skip the lock; it guards the multi-step reorders.
+
     async def add(self, track: Track) -> int:
         """Add a track to the queue. Returns queue position."""
+        self._counter += 1
+        track.insert_id = self._counter
+        self._queue.append(track)
+        return len(self._queue)
+
+    async def add_many(self, tracks: list[Track]) -> int:
+        """Add several tracks under a single lock acquisition. Returns the new queue size."""
         async with self._lock:
-            self._counter += 1
-            track.insert_id = self._counter
-            self._queue.append(track)
+            for track in tracks:
+                self._counter += 1
+                track.insert_id = self._counter
+            self._queue.extend(tracks)
             return len(self._queue)
 
     async def get_next(self) -> Optional[Track]:
         """Get and remove the next track from the queue."""
-        async with self._lock:
-            if self._queue:
-                return self._queue.pop(0)
-            return None
+        if self._queue:
+            return self._queue.popleft()
+        return None
 
     async def peek_next(self) -> Optional[Track]:
         """Peek at the next track without removing it."""
-        async with self._lock:
-            if self._queue:
-                return self._queue[0]
-            return None
+        if self._queue:
+            return self._queue[0]
+        return None
 
     async def clear(self):
         """Clear all tracks from the queue."""
@@ -49,7 +63,9 @@ class QueueManager:
         """Remove a track at a specific index (0-based). Returns removed track."""
         async with self._lock:
             if 0 <= index < len(self._queue):
-                return self._queue.pop(index)
+                track = self._queue[index]
+                del self._queue[index]
+                return track
             return None
 
     async def move(self, source_index: int, target_index: int) -> Optional[Track]:
@@ -68,7 +84,8 @@ class QueueManager:
             if source_index == target_index:
                 return self._queue[source_index]
 
-            track = self._queue.pop(source_index)
+            track = self._queue[source_index]
+            del self._queue[source_index]
             self._queue.insert(target_index, track)
             return track
 
@@ -79,14 +96,15 @@ class QueueManager:
         1: Standard (Random)
         2: Riffle (Interleave)
         """
-        import random
         async with self._lock:
             if mode == 0:
                 # Restore original order based on insert_id
-                self._queue.sort(key=lambda t: t.insert_id)
+                self._queue = deque(sorted(self._queue, key=lambda t: t.insert_id))
             elif mode == 1:
-                # Standard random shuffle
-                random.shuffle(self._queue)
+                # Standard random shuffle (on a list; deque indexing is O(n) mid-queue)
+                items = list(self._queue)
+                random.shuffle(items)
+                self._queue = deque(items)
             elif mode == 2:
                 # Riffle shuffle (Simulate card shuffling)
                 # Split into two halves and interleave
@@ -94,14 +112,16 @@ class QueueManager:
                     return
 
                 # Perform a few riffs for better effect
+                items = list(self._queue)
                 for _ in range(3):
-                    mid = len(self._queue) // 2
-                    left = self._queue[:mid]
-                    right = self._queue[mid:]
-                    self._queue = []
-                    while left or right:
-                        if left: self._queue.append(left.pop(0))
-                        if right: self._queue.append(right.pop(0))
+                    mid = len(items) // 2
+                    items = [
+                        track
+                        for pair in zip_longest(items[:mid], items[mid:], fillvalue=_RIFFLE_GAP)
+                        for track in pair
+                        if track is not _RIFFLE_GAP
+                    ]
+                self._queue = deque(items)
 
     @property
     def is_empty(self) -> bool:
@@ -115,17 +135,15 @@ class QueueManager:
 
     def as_list(self, limit: int = 20) -> list[Track]:
         """Get a copy of the queue as a list, limited to `limit` items."""
-        return self._queue[:limit]
+        return list(islice(self._queue, limit))
 
     async def put_front(self, track: Track):
         """Put a track at the front of the queue (for loop single)."""
-        async with self._lock:
-            self._queue.insert(0, track)
+        self._queue.appendleft(track)
 
     async def put_back(self, track: Track):
         """Put a track at the back of the queue (for loop queue)."""
-        async with self._lock:
-            self._queue.append(track)
+        self._queue.append(track)
 
     async def prune(self, predicate) -> list[Track]:
         """Remove tracks that do not satisfy predicate and return removed items."""
@@ -140,5 +158,5 @@ class QueueManager:
                         removed.append(track)
                 except Exception:
                     removed.append(track)
-            self._queue = kept
+            self._queue = deque(kept)
             return removed
@@ -4,22 +4,33 @@ Handles YouTube URL extraction and keyword search.
 """
 
 import asyncio
+import atexit
+import concurrent.futures
 import copy
 import logging
 import os
+import random
 import re
 import shutil
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 from dataclasses import dataclass
 
+import aiohttp
 import discord
 import yt_dlp
 
+from utils.text_utils import truncate
+
 logger = logging.getLogger('omnia.ytdl')
 POT_PROVIDER_URL = os.getenv('POT_PROVIDER_URL', 'http://pot-provider:4416')
 POT_PROVIDER_BASE = POT_PROVIDER_URL.rstrip('/')
 COOKIE_FILE = os.getenv('YTDLP_COOKIEFILE', '/app/cookies.txt')
 VISITOR_DATA = os.getenv('YTDLP_VISITOR_DATA', '').strip()
 USE_COOKIES = os.getenv('YTDLP_USE_COOKIES', '').strip().lower() in {"1", "true", "yes", "on"}
+CACHE_DIR = os.getenv('YTDLP_CACHE_DIR', '').strip()
 
 # --- Startup diagnostic: check if PO Token plugin is installed ---
 def _check_pot_plugin():
@@ -87,28 +98,54 @@ if USE_COOKIES and os.path.isfile(COOKIE_FILE):
 else:
     logger.info("yt-dlp cookie file disabled; using unauthenticated clients by default")
 
+# yt-dlp keeps player JS and signature caches on disk (~/.cache/yt-dlp by
+# default); YTDLP_CACHE_DIR moves them somewhere that survives redeploys.
+if CACHE_DIR:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    BASE_YTDL_FORMAT_OPTIONS['cachedir'] = CACHE_DIR
+    logger.info("Using yt-dlp cache directory: %s", CACHE_DIR)
+
 if VISITOR_DATA:
     BASE_YTDL_FORMAT_OPTIONS.setdefault('extractor_args', {}).setdefault('youtube', []).append(
         f'visitor_data={VISITOR_DATA}'
     )
     logger.info("Using yt-dlp visitor_data from environment")
 
-def _prewarm_ytdlp_cache():
-    """Download YT player JS and helper plugins in background so the first playback is instant."""
+def _install_fast_json():
+    """
+    Let yt-dlp's extractors parse JSON with orjson when it is installed.
+    Only plain decodes take the fast path; anything orjson rejects or that
+    needs yt-dlp's lenient decoder options falls back to the stdlib.
+    """
     try:
-        logger.info("Pre-warming yt-dlp cache in background...")
-        # 'jNQXAC9IVRw' = Me at the zoo (Shortest, highly available video)
-        # Using a full extraction to force yt-dlp to cache player JS and remote_components
-        opts = copy.deepcopy(BASE_YTDL_FORMAT_OPTIONS)
-        opts['quiet'] = True
-        ydl = yt_dlp.YoutubeDL(opts)
-        ydl.extract_info("https://www.youtube.com/watch?v=jNQXAC9IVRw", download=False)
-        logger.info("✅ Pre-warming yt-dlp cache complete. Music will load faster.")
-    except Exception as e:
-        logger.warning(f"⚠️ Pre-warming yt-dlp cache failed: {e}")
+        import orjson
+    except ImportError:
+        return
 
-import threading
-threading.Thread(target=_prewarm_ytdlp_cache, daemon=True).start()
+    import json
+    import types
+    from yt_dlp.extractor import common
+
+    plain_kwargs = {'cls', 'strict', 'ignore_extra', 'close_objects', 'transform_source'}
+
+    def loads(s, **kwargs):
+        if kwargs.get('transform_source') is None and kwargs.keys() <= plain_kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(s, **kwargs)
+
+    class _JSONModule(types.ModuleType):
+        def __getattr__(self, name):
+            return getattr(json, name)
+
+    fast_json = _JSONModule('json')
+    fast_json.loads = loads
+    common.json = fast_json
+    logger.info("Using orjson for yt-dlp JSON parsing")
+
+_install_fast_json()
 
 def build_ytdl_options(**overrides):
     """Build yt-dlp options while preserving PO Token provider settings."""
@@ -116,10 +153,207 @@ def build_ytdl_options(**overrides):
     opts.update(overrides)
     return opts
 
-FFMPEG_OPTIONS = {
-    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -analyzeduration 0 -probesize 32',
-    'options': '-vn',
-}
+# Fixed option variants, built once. Treat as read-only: _get_ydl() hands
+# yt-dlp its own copy because YoutubeDL mutates the params it is given.
+_OPTS_INFO = build_ytdl_options(noplaylist=False)
+_OPTS_SINGLE = build_ytdl_options(noplaylist=True)
+_OPTS_PLAYLIST_FLAT = build_ytdl_options(noplaylist=False, extract_flat='in_playlist', playlistend=50)
+_OPTS_DRM_SEARCH = build_ytdl_options(noplaylist=True, extract_flat='in_playlist')
+_OPTS_MIX = build_ytdl_options(
+    noplaylist=False,  # Allow playlist extraction
+    extract_flat='in_playlist',
+    playlist_items='2-6',  # Skip first (current song)
+    quiet=True,
+)
+_OPTS_RELATED_SEARCH = build_ytdl_options(extract_flat=True)
+
+# 'jNQXAC9IVRw' = Me at the zoo (Shortest, highly available video)
+PREWARM_URL = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+
+# Dedicated pool for blocking yt-dlp calls so extraction bursts stay bounded and
+# don't starve the loop's default executor.
+YTDL_MAX_WORKERS = 4
+_YTDL_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=YTDL_MAX_WORKERS, thread_name_prefix='ytdl'
+)
+atexit.register(_YTDL_EXECUTOR.shutdown, wait=False)
+
+# Background extractions (preload/prefetch, autoplay lookups) get their own
+# smaller pool so they never queue ahead of an interactive /play.
+YTDL_BG_MAX_WORKERS = 2
+_YTDL_BG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=YTDL_BG_MAX_WORKERS, thread_name_prefix='ytdl-bg'
+)
+atexit.register(_YTDL_BG_EXECUTOR.shutdown, wait=False)
+
+# Reused YoutubeDL instances, one per distinct option set and per worker
+# thread, so metadata lookups keep warm extractor state and the HTTP opener
+# between calls. YoutubeDL is not thread-safe (cookiejar, opener, progress
+# state), so instances are never shared across the executor's threads.
+_YDL_LOCAL = threading.local()
+
+
+def _get_ydl(opts: dict) -> yt_dlp.YoutubeDL:
+    """Return this thread's YoutubeDL for these options, creating it on first use."""
+    pool = getattr(_YDL_LOCAL, 'pool', None)
+    if pool is None:
+        pool = _YDL_LOCAL.pool = {}
+    key = frozenset((k, repr(v)) for k, v in opts.items())
+    ydl = pool.get(key)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(copy.deepcopy(opts))
+        pool[key] = ydl
+    return ydl
+
+
+def _extract_pooled(opts: dict, query: str) -> dict:
+    """Run extract_info on the calling worker thread's pooled YoutubeDL."""
+    return _get_ydl(opts).extract_info(query, download=False)
+
+class _TTLCache:
+    """Small in-memory LRU whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def pop(self, key: str):
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def put(self, key: str, value, ttl: float):
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+# Resolved stream data, keyed by video id (or the raw query). Entries live until
+# shortly before the signed googlevideo URL expires (its `expire` parameter), or
+# until a playback failure evicts them via YTDLSource.invalidate_stream().
+STREAM_CACHE_TTL = 240  # Used when the stream URL carries no expiry
+STREAM_EXPIRY_MARGIN = 30 * 60
+STREAM_CACHE_SIZE = 64
+_stream_cache = _TTLCache(STREAM_CACHE_SIZE)
+_STREAM_EXPIRE_RE = re.compile(r'[?&/]expire[=/](\d+)')
+# Only what the player reads from stream data; the full info dict (formats,
+# thumbnails, ...) is far larger and would be pinned for hours.
+_STREAM_FIELDS = ('url', 'title', 'duration', 'thumbnail', 'uploader', 'webpage_url')
+
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_VIDEO_PARAM_RE = re.compile(r'[?&]v=([^&]+)')
+_BRACKETED_RE = re.compile(r'\(.*?\)|\[.*?\]')
+_NETWORK_ERROR_RE = re.compile(
+    r'dns|socket|connection|temporary failure|timeout|reset|refused|handshake|remote end closed',
+    re.IGNORECASE,
+)
+
+# Search results (ytsearch1), keyed by the normalized query text
+SEARCH_CACHE_TTL = 30 * 60
+SEARCH_CACHE_SIZE = 128
+_search_cache = _TTLCache(SEARCH_CACHE_SIZE)
+
+# get_related() results, keyed by video id; empty results are never cached
+RELATED_CACHE_TTL = 24 * 60 * 60
+RELATED_CACHE_SIZE = 256
+_related_cache = _TTLCache(RELATED_CACHE_SIZE)
+
+
+# Extractions currently running, keyed by what they resolve. Concurrent callers
+# asking for the same thing await the one shared task instead of re-extracting.
+_inflight: dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(key: str, factory):
+    """Await the in-flight task for key, starting it via factory() if there is none."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the extraction for the others
+    return await asyncio.shield(task)
+
+
+OEMBED_ENDPOINT = "https://www.youtube.com/oembed"
+OEMBED_CONCURRENCY = 8
+_http_session: aiohttp.ClientSession | None = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Shared session for lightweight YouTube HTTP lookups (created lazily on the loop)."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=OEMBED_CONCURRENCY, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """Close the shared HTTP session, if one was opened."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+async def _fetch_oembed(video_url: str) -> dict | None:
+    """Fetch title/author/thumbnail for a YouTube video via oEmbed, without yt-dlp."""
+    try:
+        async with _get_http_session().get(
+            OEMBED_ENDPOINT, params={'url': video_url, 'format': 'json'}
+        ) as response:
+            if response.status != 200:
+                return None
+            return await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.warning("oEmbed lookup failed for %s: %s", video_url, e)
+        return None
+
+
+def _stream_cache_key(query: str) -> str:
+    return _extract_youtube_video_id(query) or query
+
+
+def _stream_entry(data: dict) -> dict:
+    """Trim an extraction result down to the fields kept in the stream cache."""
+    return {field: data[field] for field in _STREAM_FIELDS if field in data}
+
+
+def _stream_cache_ttl(stream_url: str) -> float:
+    """Seconds a resolved stream URL can be reused before its signature expires."""
+    match = _STREAM_EXPIRE_RE.search(stream_url or '')
+    if not match:
+        return STREAM_CACHE_TTL
+    return int(match.group(1)) - time.time() - STREAM_EXPIRY_MARGIN
+
+
+def _related_entry(entry: dict, url: str, title: str) -> dict:
+    """Build a get_related() result, keeping the metadata a flat extraction already has."""
+    thumbnails = entry.get('thumbnails') or []
+    return {
+        'url': url,
+        'title': title,
+        'duration': entry.get('duration') or 0,
+        'uploader': entry.get('uploader') or entry.get('channel') or '',
+        'thumbnail': entry.get('thumbnail') or (thumbnails[-1].get('url', '') if thumbnails else ''),
+    }
+
 
 def _is_drm_error(error: Exception) -> bool:
     """Return True when yt-dlp indicates the target media is DRM-protected."""
@@ -127,9 +361,22 @@ def _is_drm_error(error: Exception) -> bool:
     return '[drm]' in message or 'drm protection' in message
 
 
+RETRY_JITTER = 1.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so throttled guilds don't retry in lockstep."""
+    return 2 ** attempt + random.uniform(0, RETRY_JITTER)
+
+
+def _is_network_error(error: Exception) -> bool:
+    """Return True for transient network failures worth retrying."""
+    return _NETWORK_ERROR_RE.search(str(error)) is not None
+
+
 def _extract_youtube_video_id(value: str) -> str | None:
     """Extract a YouTube video id from a URL or return None."""
-    match = re.search(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})', value or '')
+    match = _VIDEO_ID_RE.search(value or '')
     return match.group(1) if match else None
 
 
@@ -154,8 +401,12 @@ class Track:
         "uploader",
         "requester",
         "insert_id",
+        "_duration_str",
+        "_display_title",
     )
 
+    DISPLAY_TITLE_LIMIT = 40
+
     def __init__(self, source_url: str, title: str, url: str, duration: int,
                  thumbnail: str, uploader: str, requester: discord.Member):
         self.source_url = source_url
@@ -175,18 +426,44 @@ class Track:
         else:
             self.requester = None
         self.insert_id = 0  # For tracking original order
+        # Render caches; title and duration don't change after construction
+        self._duration_str = None
+        self._display_title = None
+
+    @classmethod
+    def from_dict(cls, data: dict, requester: discord.Member) -> "Track":
+        """Build a not-yet-resolved track from a saved playlist entry."""
+        return cls(
+            source_url="",
+            title=data.get("title", "Unknown"),
+            url=data.get("url", ""),
+            duration=data.get("duration", 0),
+            thumbnail=data.get("thumbnail", ""),
+            uploader=data.get("uploader", "Unknown"),
+            requester=requester,
+        )
 
     @property
     def duration_str(self) -> str:
         """Format duration as MM:SS or HH:MM:SS."""
-        if not self.duration:
-            return "Live"
-        total = int(self.duration)
-        hours, remainder = divmod(total, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        if hours:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        return f"{minutes}:{seconds:02d}"
+        if self._duration_str is None:
+            if not self.duration:
+                self._duration_str = "Live"
+            else:
+                hours, remainder = divmod(int(self.duration), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                if hours:
+                    self._duration_str = f"{hours}:{minutes:02d}:{seconds:02d}"
+                else:
+                    self._duration_str = f"{minutes}:{seconds:02d}"
+        return self._duration_str
+
+    @property
+    def display_title(self) -> str:
+        """Title clipped for queue and status listings."""
+        if self._display_title is None:
+            self._display_title = truncate(self.title, self.DISPLAY_TITLE_LIMIT)
+        return self._display_title
 
 
 class YTDLSource(discord.PCMVolumeTransformer):
@@ -201,29 +478,29 @@ class YTDLSource(discord.PCMVolumeTransformer):
         self.thumbnail = data.get('thumbnail', '')
         self.uploader = data.get('uploader', 'Unknown')
 
-    @classmethod
-    async def _fetch_oembed_title(cls, video_url: str, *, loop: asyncio.AbstractEventLoop = None) -> str | None:
-        """Fetch a YouTube title via oEmbed to build a fallback search query."""
-        loop = loop or asyncio.get_event_loop()
-
-        def _request_title():
-            import json
-            import urllib.parse
-            import urllib.request
-
-            endpoint = (
-                "https://www.youtube.com/oembed?url="
-                f"{urllib.parse.quote(video_url, safe='')}&format=json"
-            )
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                payload = json.load(response)
-            return payload.get('title')
+    _prewarmed = False
 
+    @classmethod
+    async def prewarm(cls, *, loop: asyncio.AbstractEventLoop = None):
+        """
+        Run one throwaway extraction through the shared metadata YoutubeDL so the
+        player JS and extractor state are warm before the first /play.
+        """
+        if cls._prewarmed:
+            return
+        cls._prewarmed = True
         try:
-            return await loop.run_in_executor(None, _request_title)
+            logger.info("Pre-warming yt-dlp cache in background...")
+            await cls.get_info(PREWARM_URL, loop=loop)
+            logger.info("✅ Pre-warming yt-dlp cache complete. Music will load faster.")
         except Exception as e:
-            logger.warning(f"Failed to fetch oEmbed title for DRM fallback: {e}")
-            return None
+            logger.warning("⚠️ Pre-warming yt-dlp cache failed: %s", e)
+
+    @classmethod
+    async def _fetch_oembed_title(cls, video_url: str, *, loop: asyncio.AbstractEventLoop = None) -> str | None:
+        """Fetch a YouTube title via oEmbed to build a fallback search query."""
+        data = await _fetch_oembed(video_url)
+        return data.get('title') if data else None
 
     @classmethod
     async def _find_non_drm_alternative(
@@ -233,6 +510,7 @@ class YTDLSource(discord.PCMVolumeTransformer):
         loop: asyncio.AbstractEventLoop = None,
         title_hint: str = "",
         uploader_hint: str = "",
+        executor: concurrent.futures.Executor = _YTDL_EXECUTOR,
     ) -> dict | None:
         """Search for a non-DRM alternative when the requested video cannot be played."""
         loop = loop or asyncio.get_event_loop()
@@ -255,15 +533,13 @@ class YTDLSource(discord.PCMVolumeTransformer):
         original_id = _extract_youtube_video_id(video_url)
         for term in search_terms:
             query = f"ytsearch5:{term} audio"
-            opts = build_ytdl_options(noplaylist=True, extract_flat='in_playlist')
-            ydl_search = yt_dlp.YoutubeDL(opts)
             try:
-                logger.warning(f'DRM fallback: searching alternative for "{term}"')
+                logger.warning('DRM fallback: searching alternative for "%s"', term)
                 data = await loop.run_in_executor(
-                    None, lambda: ydl_search.extract_info(query, download=False)
+                    executor, _extract_pooled, _OPTS_DRM_SEARCH, query
                 )
             except Exception as e:
-                logger.warning(f"DRM fallback search failed for '{term}': {e}")
+                logger.warning("DRM fallback search failed for '%s': %s", term, e)
                 continue
 
             entries = data.get('entries') if isinstance(data, dict) else None
@@ -285,7 +561,7 @@ class YTDLSource(discord.PCMVolumeTransformer):
                 if not alt_url:
                     continue
                 entry['webpage_url'] = alt_url
-                logger.warning(f"DRM fallback selected alternative: {entry.get('title', alt_url)}")
+                logger.warning("DRM fallback selected alternative: %s", entry.get('title', alt_url))
                 return entry
 
         return None
@@ -306,61 +582,60 @@ class YTDLSource(discord.PCMVolumeTransformer):
         loop = loop or asyncio.get_event_loop()
 
         # Check if it's a search query
-        is_search = not query.startswith(('http://', 'https://'))
+        is_search = '://' not in query[:8]
+        search_key = None
         if is_search:
+            search_key = ' '.join(query.lower().split())
+            cached = _search_cache.get(search_key)
+            if cached is not None:
+                return list(cached), None
             query = f'ytsearch1:{query}'
 
         # Options: allow playlist, extract flat for speed
-        opts = build_ytdl_options(noplaylist=False)
+        opts = _OPTS_INFO
 
         # Detect YouTube Radio/Mix URLs (list=RD...) — treat as single song
         is_radio = not is_search and 'list=RD' in query
         if is_radio:
             # Extract just the video ID and play as single song
-            video_match = re.search(r'[?&]v=([^&]+)', query)
+            video_match = _VIDEO_PARAM_RE.search(query)
             if video_match:
                 query = f'https://www.youtube.com/watch?v={video_match.group(1)}'
-            opts['noplaylist'] = True
+            opts = _OPTS_SINGLE
         elif not is_search and 'list=' in query:
             # Regular playlist: extract flat for speed
-            opts['extract_flat'] = 'in_playlist'
             if playlist_items:
-                opts['playlist_items'] = playlist_items
+                opts = build_ytdl_options(
+                    noplaylist=False, extract_flat='in_playlist', playlist_items=playlist_items
+                )
             else:
-                opts['playlistend'] = 50  # Limit to 50 songs max
-        elif is_search:
-             # Search: use extract_flat to avoid downloading audio stream metadata up-front, making responses instant
-            opts['extract_flat'] = 'in_playlist'
+                opts = _OPTS_PLAYLIST_FLAT  # Limit to 50 songs max
+        # Search is fully extracted: the single result then already carries its
+        # stream URL, so playback does not need a second extraction.
+
 
-        ydl = yt_dlp.YoutubeDL(opts)
-        
         # Retry logic for network errors
         data = None
         last_error = None
         for attempt in range(3):
             try:
                 data = await loop.run_in_executor(
-                    None, lambda: ydl.extract_info(query, download=False)
+                    _YTDL_EXECUTOR, _extract_pooled, opts, query
                 )
                 break
             except Exception as e:
                 last_error = e
                 if _is_drm_error(e) and not is_search:
-                    logger.warning(f"DRM detected during get_info for {query}. Trying alternative search.")
+                    logger.warning("DRM detected during get_info for %s. Trying alternative search.", query)
                     alternative = await cls._find_non_drm_alternative(video_url=query, loop=loop)
                     if alternative:
                         data = {'entries': [alternative]}
                         is_search = True
                         break
                 # Check for common network errors
-                error_str = str(e).lower()
-                network_errors = [
-                    'dns', 'socket', 'connection', 'temporary failure', 
-                    'timeout', 'reset', 'refused', 'handshake', 'remote end closed'
-                ]
-                if any(err in error_str for err in network_errors):
-                    wait = 2 ** attempt
-                    logger.warning(f"YTDL network error, retrying in {wait}s... ({e})")
+                if _is_network_error(e):
+                    wait = _retry_delay(attempt)
+                    logger.warning("YTDL network error, retrying in %.1fs... (%s)", wait, e)
                     await asyncio.sleep(wait)
                     continue
                 raise e
@@ -406,14 +681,28 @@ class YTDLSource(discord.PCMVolumeTransformer):
             else:
                 # Playlist URL
                 is_playlist = True
-                all_entries = list(data['entries'])
-                entries = all_entries[:50]  # Cap at 50 songs
+                entries = list(islice(data['entries'], 50))  # Cap at 50 songs
                 # Fix up playlist entries if flat extracted
                 for entry in entries:
-                     if not entry.get('url') and entry.get('id'):
-                        entry['url'] = f"https://www.youtube.com/watch?v={entry['id']}"
-                     if not entry.get('thumbnail') and entry.get('id'):
-                        entry['thumbnail'] = f"https://i.ytimg.com/vi/{entry['id']}/hqdefault.jpg"
+                    entry_id = entry.get('id')
+                    if not entry_id:
+                        continue
+                    if not entry.get('url'):
+                        entry['url'] = f"https://www.youtube.com/watch?v={entry_id}"
+                    if not entry.get('thumbnail'):
+                        entry['thumbnail'] = f"https://i.ytimg.com/vi/{entry_id}/hqdefault.jpg"
+
+                # Flat entries occasionally lack a title; fill those over plain
+                # HTTP instead of a yt-dlp extraction per entry.
+                untitled = [entry for entry in entries if not entry.get('title') and entry.get('url')]
+                if untitled:
+                    results = await asyncio.gather(*(_fetch_oembed(entry['url']) for entry in untitled))
+                    for entry, meta in zip(untitled, results):
+                        if not meta:
+                            continue
+                        entry['title'] = meta.get('title') or entry.get('title')
+                        if not entry.get('uploader'):
+                            entry['uploader'] = meta.get('author_name')
 
         else:
             # Single video (full extraction usually, unless forced flat)
@@ -421,7 +710,18 @@ class YTDLSource(discord.PCMVolumeTransformer):
 
         if not entries:
             raise ValueError("Tidak ditemukan hasil.")
-            
+
+        if search_key:
+            ttl = SEARCH_CACHE_TTL
+            entry = entries[0]
+            stream_url = entry.get('url', '')
+            if 'googlevideo' in stream_url:
+                # Don't hand out a cached search hit whose stream URL has expired
+                stream_ttl = _stream_cache_ttl(stream_url)
+                ttl = min(ttl, stream_ttl)
+                if entry.get('webpage_url'):
+                    _stream_cache.put(_stream_cache_key(entry['webpage_url']), _stream_entry(entry), stream_ttl)
+            _search_cache.put(search_key, list(entries), ttl)
         return entries, (playlist_title if is_playlist else None)
 
 
@@ -433,11 +733,41 @@ class YTDLSource(discord.PCMVolumeTransformer):
         loop: asyncio.AbstractEventLoop = None,
         title_hint: str = "",
         uploader_hint: str = "",
+        background: bool = False,
     ) -> dict:
         """
         Extract stream data (audio URL) for a specific video.
-        Used for pre-fetching or playback.
+        Used for pre-fetching or playback. Results are cached per video until
+        shortly before the stream URL expires. Pass background=True for
+        pre-fetching so it runs on the background pool.
         """
+        key = _stream_cache_key(query)
+        cached = _stream_cache.get(key)
+        if cached is not None:
+            return cached
+
+        return await _single_flight(
+            f'stream:{key}',
+            lambda: cls._extract_stream_data(
+                query,
+                loop=loop,
+                title_hint=title_hint,
+                uploader_hint=uploader_hint,
+                executor=_YTDL_BG_EXECUTOR if background else _YTDL_EXECUTOR,
+            ),
+        )
+
+    @classmethod
+    async def _extract_stream_data(
+        cls,
+        query: str,
+        *,
+        loop: asyncio.AbstractEventLoop = None,
+        title_hint: str = "",
+        uploader_hint: str = "",
+        executor: concurrent.futures.Executor = _YTDL_EXECUTOR,
+    ) -> dict:
+        """Run the actual stream extraction for get_stream_data()."""
         loop = loop or asyncio.get_event_loop()
         # Create a fresh instance per extraction so yt-dlp state is not shared
         # across concurrent playback, preload, and seek operations.
@@ -449,36 +779,32 @@ class YTDLSource(discord.PCMVolumeTransformer):
         for attempt in range(3):
             try:
                 data = await loop.run_in_executor(
-                    None, lambda: ytdl.extract_info(query, download=False)
+                    executor, lambda: ytdl.extract_info(query, download=False)
                 )
                 break
             except Exception as e:
                 last_error = e
                 if _is_drm_error(e):
-                    logger.warning(f"DRM detected during stream extraction for {query}. Trying alternative search.")
+                    logger.warning("DRM detected during stream extraction for %s. Trying alternative search.", query)
                     alternative = await cls._find_non_drm_alternative(
                         video_url=query,
                         loop=loop,
                         title_hint=title_hint,
                         uploader_hint=uploader_hint,
+                        executor=executor,
                     )
                     if alternative:
                         alt_url = alternative.get('webpage_url') or alternative.get('url')
                         if not alt_url:
                             continue
                         data = await loop.run_in_executor(
-                            None, lambda: ytdl.extract_info(alt_url, download=False)
+                            executor, lambda: ytdl.extract_info(alt_url, download=False)
                         )
                         break
                 # Check for common network errors
-                error_str = str(e).lower()
-                network_errors = [
-                    'dns', 'socket', 'connection', 'temporary failure', 
-                    'timeout', 'reset', 'refused', 'handshake', 'remote end closed'
-                ]
-                if any(err in error_str for err in network_errors):
-                    wait = 2 ** attempt
-                    logger.warning(f"YTDL extraction error (playback), retrying in {wait}s... ({e})")
+                if _is_network_error(e):
+                    wait = _retry_delay(attempt)
+                    logger.warning("YTDL extraction error (playback), retrying in %.1fs... (%s)", wait, e)
                     await asyncio.sleep(wait)
                     continue
                 raise e
@@ -493,113 +819,94 @@ class YTDLSource(discord.PCMVolumeTransformer):
 
         if 'entries' in data:
             data = data['entries'][0]
-            
+
+        if data and data.get('url'):
+            data = _stream_entry(data)
+            _stream_cache.put(_stream_cache_key(query), data, _stream_cache_ttl(data['url']))
         return data
 
     @classmethod
-    async def from_url(
-        cls,
-        query: str,
-        *,
-        loop: asyncio.AbstractEventLoop = None,
-        title_hint: str = "",
-        uploader_hint: str = "",
-        ffmpeg_options: dict | None = None,
-    ):
-        """
-        Create audio source from a SPECIFIC URL (used by player).
-        """
-        data = await cls.get_stream_data(
-            query,
-            loop=loop,
-            title_hint=title_hint,
-            uploader_hint=uploader_hint,
-        )
-
-        source_url = data.get('url')
-        if not source_url:
-            raise ValueError("Gagal mendapatkan URL audio.")
-
-        source = discord.FFmpegPCMAudio(source_url, **(ffmpeg_options or FFMPEG_OPTIONS))
-        return cls(source, data=data), data
+    def invalidate_stream(cls, query: str):
+        """Drop the cached stream data for a video, e.g. after its URL failed mid-playback."""
+        _stream_cache.pop(_stream_cache_key(query))
 
     @classmethod
     async def get_related(cls, video_url: str, title: str = "", *, loop: asyncio.AbstractEventLoop = None) -> list:
         """
         Get related videos for autoplay.
-        Returns list of dicts with 'url' and 'title' keys.
+        Returns list of dicts with 'url' and 'title' keys, plus 'duration',
+        'uploader' and 'thumbnail' when the flat extraction provides them.
         
         Strategy:
         1. Try YouTube Radio Mix (RD playlist) for the video
         2. Fallback: search YouTube with the track title
         """
+        video_id = _extract_youtube_video_id(video_url)
+        key = video_id or f"{video_url}:{title}"
+        cached = _related_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        related = await _single_flight(
+            f"related:{key}", lambda: cls._fetch_related(video_url, title, loop=loop)
+        )
+        if related:
+            _related_cache.put(key, related, RELATED_CACHE_TTL)
+        return list(related)
+
+    @classmethod
+    async def _fetch_related(cls, video_url: str, title: str = "", *, loop: asyncio.AbstractEventLoop = None) -> list:
+        """Run the get_related() strategies in order and return the first non-empty result."""
         loop = loop or asyncio.get_event_loop()
-        import re
-        # logger already initialized at module level
 
-        related = []
+        async def _fetch_mix() -> list:
+            related = []
+            try:
+                video_id = _extract_youtube_video_id(video_url)
+                if video_id:
+                    mix_url = f"https://www.youtube.com/watch?v={video_id}&list=RD{video_id}"
+                    mix_data = await loop.run_in_executor(
+                        _YTDL_BG_EXECUTOR, _extract_pooled, _OPTS_MIX, mix_url
+                    )
+                    if mix_data and 'entries' in mix_data:
+                        for entry in mix_data['entries']:
+                            if entry and (entry.get('url') or entry.get('id')):
+                                url = entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+                                related.append(_related_entry(entry, url, entry.get('title', 'Unknown')))
+                        if related:
+                            logger.debug("Autoplay: Found %d tracks from YouTube Mix", len(related))
+            except Exception as e:
+                logger.warning("Autoplay Mix failed: %s", e)
+            return related
 
-        # --- Strategy 1: YouTube Radio Mix ---
-        try:
-            # Extract video ID from URL
-            video_id = None
-            id_match = re.search(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})', video_url)
-            if id_match:
-                video_id = id_match.group(1)
+        async def _fetch_search() -> list:
+            related = []
+            try:
+                search_query = title if title else video_url
+                # Clean up title for better search results
+                search_query = _BRACKETED_RE.sub('', search_query).strip()
+                search_query = f"ytsearch5:{search_query} music"
 
-            if video_id:
-                mix_url = f"https://www.youtube.com/watch?v={video_id}&list=RD{video_id}"
-                mix_opts = build_ytdl_options(
-                    noplaylist=False,  # Allow playlist extraction
-                    extract_flat='in_playlist',
-                    playlist_items='2-6',  # Skip first (current song)
-                    quiet=True,
+                search_data = await loop.run_in_executor(
+                    _YTDL_BG_EXECUTOR, _extract_pooled, _OPTS_RELATED_SEARCH, search_query
                 )
-                ydl_mix = yt_dlp.YoutubeDL(mix_opts)
-                mix_data = await loop.run_in_executor(
-                    None, lambda: ydl_mix.extract_info(mix_url, download=False)
-                )
-                if mix_data and 'entries' in mix_data:
-                    for entry in mix_data['entries']:
+                if search_data and 'entries' in search_data:
+                    for entry in search_data['entries']:
                         if entry and (entry.get('url') or entry.get('id')):
-                            url = entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
-                            related.append({
-                                'url': url,
-                                'title': entry.get('title', 'Unknown')
-                            })
+                            entry_url = entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+                            # Skip if it's the same video
+                            if video_url and entry.get('id') and entry['id'] in video_url:
+                                continue
+                            related.append(_related_entry(entry, entry_url, entry.get('title') or entry_url))
                     if related:
-                        logger.info(f"Autoplay: Found {len(related)} tracks from YouTube Mix")
-                        return related
-        except Exception as e:
-            logger.warning(f"Autoplay Mix failed: {e}")
-
-        # --- Strategy 2: Search YouTube with track title ---
-        try:
-            search_query = title if title else video_url
-            # Clean up title for better search results
-            search_query = re.sub(r'\(.*?\)|\[.*?\]', '', search_query).strip()
-            search_query = f"ytsearch5:{search_query} music"
-
-            search_opts = build_ytdl_options(extract_flat=True)
-            ydl_search = yt_dlp.YoutubeDL(search_opts)
-            search_data = await loop.run_in_executor(
-                None, lambda: ydl_search.extract_info(search_query, download=False)
-            )
-            if search_data and 'entries' in search_data:
-                for entry in search_data['entries']:
-                    if entry and (entry.get('url') or entry.get('id')):
-                        entry_url = entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
-                        # Skip if it's the same video
-                        if video_url and entry.get('id') and entry['id'] in video_url:
-                            continue
-                        related.append({
-                            'url': entry_url,
-                            'title': entry_url
-                        })
-                if related:
-                    logger.info(f"Autoplay: Found {len(related)} tracks from YouTube Search")
-                    return related
-        except Exception as e:
-            logger.warning(f"Autoplay Search failed: {e}")
-
-        return related
+                        logger.debug("Autoplay: Found %d tracks from YouTube Search", len(related))
+            except Exception as e:
+                logger.warning("Autoplay Search failed: %s", e)
+            return related
+
+        # Search only when the Mix misses: a cancelled executor call would still
+        # hold a worker until yt-dlp returns.
+        related = await _fetch_mix()
+        if related:
+            return related
+        return await _fetch_search()
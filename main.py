@@ -47,6 +47,9 @@ bot = commands.Bot(
     description='Omnia Music Bot 🎵'
 )
 
+# Strong references to fire-and-forget tasks so they aren't garbage-collected mid-run
+_background_tasks: set[asyncio.Task] = set()
+
 
 @bot.event
 async def on_ready():
@@ -71,6 +74,12 @@ async def on_ready():
         )
     )
 
+    # Warm yt-dlp in the background so the first /play doesn't pay the cold-start cost
+    from core.ytdl_source import YTDLSource
+    task = asyncio.create_task(YTDLSource.prewarm(loop=bot.loop))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
 
 async def load_cogs():
     """Load all cogs."""
@@ -1,12 +1,9 @@
 
 import re
 
-def _clean_title(title: str) -> str:
-    """
-    Clean a YouTube video title for better Genius search results.
-    """
-    # Remove common YouTube tags
-    patterns = [
+# Common YouTube tags, compiled once and applied in order
+_TAG_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
         r'\(Official\s*(Music\s*)?Video\)',
         r'\(Official\s*Audio\)',
         r'\(Lyric\s*Video\)',
@@ -35,15 +32,26 @@ def _clean_title(title: str) -> str:
         r'\(Remix\)',
         r'\(Cover\)',
         r'with\s+Lyrics',
-    ]
+    )
+]
+_TRAILING_SEP_RE = re.compile(r'\s*[-|]\s*$')
+_LEADING_SEP_RE = re.compile(r'^\s*[-|]\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SEP_PATTERNS = [re.compile(r'\s-\s'), re.compile(r'\s:\s'), re.compile(r'\s\|\s')]
+
+def _clean_title(title: str) -> str:
+    """
+    Clean a YouTube video title for better Genius search results.
+    """
+    # Remove common YouTube tags
     cleaned = title
-    for pattern in patterns:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+    for pattern in _TAG_PATTERNS:
+        cleaned = pattern.sub('', cleaned)
 
     # Remove extra whitespace and trailing dashes/pipes
-    cleaned = re.sub(r'\s*[-|]\s*$', '', cleaned)
-    cleaned = re.sub(r'^\s*[-|]\s*', '', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = _TRAILING_SEP_RE.sub('', cleaned)
+    cleaned = _LEADING_SEP_RE.sub('', cleaned)
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
     return cleaned if cleaned else title
 
@@ -53,10 +61,8 @@ def _extract_metadata(query: str) -> dict:
     Returns dict with 'artist' and 'title' if successful, else content is just 'query'.
     """
     # Common separators: " - ", " : ", " | "
-    separators = [r'\s-\s', r'\s:\s', r'\s\|\s']
-    
-    for sep in separators:
-        parts = re.split(sep, query, maxsplit=1)
+    for pattern in _SEP_PATTERNS:
+        parts = pattern.split(query, maxsplit=1)
         if len(parts) == 2:
             return {'artist': parts[0].strip(), 'title': parts[1].strip()}
             
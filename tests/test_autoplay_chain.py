@@ -1,8 +1,10 @@
 import asyncio
+import heapq
 import logging
 import random
 import sys
 import os
+from collections import deque
 
 # Add parent directory to path to import core modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -11,36 +13,50 @@ from core.ytdl_source import YTDLSource
 
 logging.basicConfig(level=logging.WARNING) # Reduce noise
 
+HISTORY_LIMIT = 200  # URLs remembered for duplicate suppression
+
 class MockTrack:
+    __slots__ = ('title', 'uploader', 'url')
+
     def __init__(self, title, uploader, url):
         self.title = title
         self.uploader = uploader
         self.url = url
 
 async def test_chain(mode_name, seed_track, chain_length=5):
-    print(f"\n{'='*10} CHAIN MODE: {mode_name} {'='*10}")
+    # Buffer this chain's output so concurrent chains don't interleave
+    lines = []
+    log = lines.append
+    log(f"\n{'='*10} CHAIN MODE: {mode_name} {'='*10}")
     
     current_track = seed_track
-    history = [current_track.url]
+    # Bounded play order plus a set for O(1) membership, like the player's history
+    history = deque([current_track.url], maxlen=HISTORY_LIMIT)
+    history_urls = {current_track.url}
     
     for step in range(1, chain_length + 1):
-        print(f"\n--- Step {step} ---")
-        print(f"Current: {current_track.title} ({current_track.uploader})")
+        log(f"\n--- Step {step} ---")
+        log(f"Current: {current_track.title} ({current_track.uploader})")
         
         # Fetch related
         related = await YTDLSource.get_related(current_track.url, title=current_track.title)
         
         if not related:
-            print("No related tracks found! Chain broken.")
+            log("No related tracks found! Chain broken.")
             break
             
         # Filter history
-        fresh = [r for r in related if r.get('url') not in history]
+        fresh = [r for r in related if r.get('url') not in history_urls]
         if not fresh:
-            print("All related tracks already played. Using full list.")
+            log("All related tracks already played. Using full list.")
             fresh = related
             
         chosen = None
+
+        # Features of the current track, shared by every score call below
+        current_uploader = current_track.uploader.lower()
+        match_uploader = len(current_uploader) > 2
+        current_words = tuple(w for w in current_track.title.lower().split() if len(w) > 3)
         
         if mode_name == "YOUTUBE":
             chosen = random.choice(fresh)
@@ -49,50 +65,49 @@ async def test_chain(mode_name, seed_track, chain_length=5):
             def score_custom1(video):
                 score = random.uniform(0, 10)
                 title = video.get('title', '').lower()
-                current_uploader = current_track.uploader.lower()
-                if current_uploader and len(current_uploader) > 2 and current_uploader in title:
+                if match_uploader and current_uploader in title:
                      score += 5
-                current_words = [w for w in current_track.title.lower().split() if len(w) > 3]
                 match_count = sum(1 for w in current_words if w in title)
                 score += match_count * 2
                 return score
                 
-            fresh.sort(key=score_custom1, reverse=True)
-            candidates = fresh[:3]
+            candidates = heapq.nlargest(3, fresh, key=score_custom1)
             chosen = random.choice(candidates)
             
         elif mode_name == "CUSTOM 2":
             def score_custom2(video):
                 score = random.uniform(0, 10)
                 title = video.get('title', '').lower()
-                current_uploader = current_track.uploader.lower()
-                if current_uploader and len(current_uploader) > 2 and current_uploader in title:
+                if match_uploader and current_uploader in title:
                      score += 5
-                current_words = [w for w in current_track.title.lower().split() if len(w) > 3]
                 match_count = sum(1 for w in current_words if w in title)
                 score -= match_count * 2  # Penalize similarities
                 return score
                 
-            fresh.sort(key=score_custom2, reverse=True)
-            candidates = fresh[:10]  # Wider pool
+            candidates = heapq.nlargest(10, fresh, key=score_custom2)  # Wider pool
             if candidates:
                 chosen = random.choice(candidates)
             else:
                  chosen = random.choice(fresh)
 
         if chosen:
-             print(f"Next ⏭️ : {chosen.get('title')}")
+             log(f"Next ⏭️ : {chosen.get('title')}")
              # Update for next iteration
              next_url = chosen.get('url')
+             if len(history) == history.maxlen:
+                 history_urls.discard(history.popleft())
              history.append(next_url)
+             history_urls.add(next_url)
              
              # Extract basic info for the next track's "uploader" approximation
              # We just use the title to emulate the next search since we don't full extract to save time
              current_track = MockTrack(chosen.get('title'), "", next_url)
         else:
-             print("Failed to choose track.")
+             log("Failed to choose track.")
              break
 
+    print("\n".join(lines))
+
 async def main():
     seed_title = "Bohemian Rhapsody"
     seed_uploader = "Queen"
@@ -102,9 +117,12 @@ async def main():
     
     print(f"Seed Track: {seed.title} by {seed.uploader}")
     
-    await test_chain("YOUTUBE", seed, chain_length=5)
-    await test_chain("CUSTOM 1", seed, chain_length=5)
-    await test_chain("CUSTOM 2", seed, chain_length=5)
+    # Independent chains: overlap their network lookups
+    await asyncio.gather(
+        test_chain("YOUTUBE", seed, chain_length=5),
+        test_chain("CUSTOM 1", seed, chain_length=5),
+        test_chain("CUSTOM 2", seed, chain_length=5),
+    )
 
 if __name__ == "__main__":
     asyncio.run(main())
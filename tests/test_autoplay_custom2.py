@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import logging
 import random
 import sys
@@ -12,6 +13,8 @@ from core.ytdl_source import YTDLSource
 logging.basicConfig(level=logging.INFO)
 
 class MockTrack:
+    __slots__ = ('title', 'uploader')
+
     def __init__(self, title, uploader):
         self.title = title
         self.uploader = uploader
@@ -47,24 +50,25 @@ async def main():
         print(f"{i+1}. {t.get('title')}")
     print()
     
+    # Features of the seed track, shared by every score call below
+    current_uploader = current_track.uploader.lower()
+    match_uploader = len(current_uploader) > 2
+    current_words = tuple(w for w in current_track.title.lower().split() if len(w) > 3)
+
     # Mode 2: Custom 1 (Relevant)
     print("=== MODE: CUSTOM 1 (Relevant) ===")
     def score_video_custom1(video):
         score = random.uniform(0, 10)
         title = video.get('title', '').lower()
         
-        current_uploader = current_track.uploader.lower()
-        if current_uploader and len(current_uploader) > 2 and current_uploader in title:
+        if match_uploader and current_uploader in title:
              score += 5
              
-        current_words = [w for w in current_track.title.lower().split() if len(w) > 3]
         match_count = sum(1 for w in current_words if w in title)
         score += match_count * 2
         return score
         
-    custom1_list = list(related)
-    custom1_list.sort(key=score_video_custom1, reverse=True)
-    custom1_candidates = custom1_list[:3]
+    custom1_candidates = heapq.nlargest(3, related, key=score_video_custom1)
     for i, t in enumerate(custom1_candidates):
         print(f"{i+1}. {t.get('title')} (Top Candidate)")
     print(f"-> Chosen: {random.choice(custom1_candidates).get('title')}\n")
@@ -75,18 +79,14 @@ async def main():
         score = random.uniform(0, 10)
         title = video.get('title', '').lower()
         
-        current_uploader = current_track.uploader.lower()
-        if current_uploader and len(current_uploader) > 2 and current_uploader in title:
+        if match_uploader and current_uploader in title:
              score += 5
              
-        current_words = [w for w in current_track.title.lower().split() if len(w) > 3]
         match_count = sum(1 for w in current_words if w in title)
         score -= match_count * 2  # PENALIZE exact matches
         return score
         
-    custom2_list = list(related)
-    custom2_list.sort(key=score_video_custom2, reverse=True)
-    custom2_candidates = custom2_list[:10]
+    custom2_candidates = heapq.nlargest(10, related, key=score_video_custom2)
     
     for i, t in enumerate(custom2_candidates[:5]): # show top 5 of 10
         print(f"{i+1}. {t.get('title')} (Top Candidate pool)")
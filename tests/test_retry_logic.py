@@ -1,7 +1,8 @@
 
 import asyncio
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import sys
 import os
 
@@ -11,38 +12,73 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.ytdl_source import YTDLSource
 
 class TestYTDLRetry(unittest.IsolatedAsyncioTestCase):
-    async def test_retry_success(self):
+    # Backoff sleeps are mocked out so retries don't wait in real time
+    @patch('core.ytdl_source.asyncio.sleep', new_callable=AsyncMock)
+    @patch('core.ytdl_source._get_ydl')
+    async def test_retry_success(self, mock_get_ydl, mock_sleep):
         """Test that it retries on network error and eventually succeeds."""
-        with patch('yt_dlp.YoutubeDL') as mock_ytdl:
-            instance = mock_ytdl.return_value
-            # Fail twice with DNS error, then succeed
-            instance.extract_info.side_effect = [
-                Exception("Temporary failure in name resolution"),
-                Exception("Connection reset by peer"),
-                {'title': 'Test Song', 'webpage_url': 'http://test.com', 'duration': 100}
-            ]
-
-            print("\nRunning retry test (expecting 2 failures)...")
-            entries, playlist_title = await YTDLSource.get_info("http://test.com")
-            
-            self.assertEqual(len(entries), 1)
-            self.assertEqual(entries[0]['title'], 'Test Song')
-            self.assertEqual(instance.extract_info.call_count, 3)
-            print("Retry test passed!")
-
-    async def test_retry_failure(self):
+        instance = mock_get_ydl.return_value
+        # Fail twice with DNS error, then succeed
+        instance.extract_info.side_effect = [
+            Exception("Temporary failure in name resolution"),
+            Exception("Connection reset by peer"),
+            {'title': 'Test Song', 'webpage_url': 'http://test.com', 'duration': 100}
+        ]
+
+        print("\nRunning retry test (expecting 2 failures)...")
+        entries, playlist_title = await YTDLSource.get_info("http://test.com")
+        
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['title'], 'Test Song')
+        self.assertEqual(instance.extract_info.call_count, 3)
+        self.assertEqual(mock_sleep.await_count, 2)
+        print("Retry test passed!")
+
+    @patch('core.ytdl_source.asyncio.sleep', new_callable=AsyncMock)
+    @patch('core.ytdl_source._get_ydl')
+    async def test_retry_failure(self, mock_get_ydl, mock_sleep):
         """Test that it eventually fails after max retries."""
-        with patch('yt_dlp.YoutubeDL') as mock_ytdl:
-            instance = mock_ytdl.return_value
-            # Fail 3 times
-            instance.extract_info.side_effect = Exception("Temporary failure in name resolution")
-
-            print("\nRunning failure test (expecting 3 failures)...")
-            with self.assertRaises(Exception):
-                await YTDLSource.get_info("http://test.com")
-            
-            self.assertEqual(instance.extract_info.call_count, 3)
-            print("Failure test passed!")
+        instance = mock_get_ydl.return_value
+        # Fail 3 times
+        instance.extract_info.side_effect = Exception("Temporary failure in name resolution")
+
+        print("\nRunning failure test (expecting 3 failures)...")
+        with self.assertRaises(Exception):
+            await YTDLSource.get_info("http://test.com")
+        
+        self.assertEqual(instance.extract_info.call_count, 3)
+        print("Failure test passed!")
+
+class TestStreamRecovery(unittest.IsolatedAsyncioTestCase):
+    @patch('core.music_player.asyncio.sleep', new_callable=AsyncMock)
+    @patch('yt_dlp.YoutubeDL')
+    async def test_retry_resolves_fresh_url(self, mock_ytdl, mock_sleep):
+        """A failed stream URL is evicted so the retry re-extracts a fresh one."""
+        from core.music_player import MusicPlayer
+        from core.ytdl_source import Track
+
+        expire = int(time.time()) + 6 * 3600
+        dead = f"https://rr1.googlevideo.com/videoplayback?expire={expire}&id=dead"
+        fresh = f"https://rr2.googlevideo.com/videoplayback?expire={expire}&id=fresh"
+        mock_ytdl.return_value.extract_info.side_effect = [
+            {'url': dead, 'title': 'Test Song', 'duration': 100},
+            {'url': fresh, 'title': 'Test Song', 'duration': 100},
+        ]
+        page_url = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+
+        data = await YTDLSource.get_stream_data(page_url)
+        track = Track(data['url'], 'Test Song', page_url, 100, '', 'Tester', None)
+        self.assertEqual(track.source_url, dead)
+
+        player = MusicPlayer(MagicMock(), MagicMock())
+        with patch.object(MusicPlayer, 'play_next', new_callable=AsyncMock) as play_next:
+            await player._recover_from_playback_error(track, Exception("HTTP error 403 Forbidden"))
+
+        self.assertEqual(track.source_url, "")
+        play_next.assert_awaited_once()
+        retried = await YTDLSource.get_stream_data(page_url)
+        self.assertEqual(retried['url'], fresh)
+        self.assertEqual(mock_ytdl.return_value.extract_info.call_count, 2)
 
 if __name__ == '__main__':
     unittest.main()
@@ -18,6 +18,9 @@ class EmbedBuilder:
     COLOR_ERROR = discord.Color.from_rgb(231, 76, 60)      # Red
     COLOR_INFO = discord.Color.from_rgb(52, 152, 219)      # Blue
     COLOR_AUTOPLAY = discord.Color.from_rgb(255, 165, 0)   # Orange
+    COLOR_DANGER = discord.Color.from_rgb(220, 20, 60)     # Crimson
+    COLOR_LYRICS_SYNCED = discord.Color.from_rgb(0, 255, 255)  # Cyan (Lrclib)
+    COLOR_LYRICS = discord.Color.from_rgb(255, 255, 100)   # Yellow (Genius)
 
     @staticmethod
     def now_playing(track: Track, progress: str | None = None) -> discord.Embed:
@@ -85,46 +88,49 @@ class EmbedBuilder:
             return embed
 
         # Process tracks
-        current_field_text = ""
+        first_field_name = f"📋 Antrian ({total_size} lagu)"
+        next_field_name = "📋 Antrian (Lanjutan)"
+        field_lines = []
+        field_length = 0
         current_field_index = 0
         field_limit = 1024
         
-        for i, track in enumerate(tracks, 1):
-            # Truncate title
-            title = track.title
-            if len(title) > 40:
-                title = title[:37] + "..."
-            
-            line = f"`{i}.` **[{title}]({track.url})** [{track.duration_str}]\n"
-            
+        lines = [
+            f"`{i}.` **[{track.display_title}]({track.url})** [{track.duration_str}]\n"
+            for i, track in enumerate(tracks, 1)
+        ]
+        for line in lines:
             # Check length for current field (leave buffer for footer if this is the last chunk)
-            if len(current_field_text) + len(line) > 1000:
+            if field_length + len(line) > 1000:
                 # Field full, add it and start new one
-                field_name = f"📋 Antrian ({total_size} lagu)" if current_field_index == 0 else "📋 Antrian (Lanjutan)"
-                embed.add_field(name=field_name, value=current_field_text, inline=False)
-                current_field_text = ""
+                field_name = first_field_name if current_field_index == 0 else next_field_name
+                embed.add_field(name=field_name, value="".join(field_lines), inline=False)
+                field_lines = []
+                field_length = 0
                 current_field_index += 1
             
-            current_field_text += line
+            field_lines.append(line)
+            field_length += len(line)
 
         # Add remaining text
-        if current_field_text:
+        if field_lines:
+            current_field_text = "".join(field_lines)
             # Check if we need to add "and X others"
             if total_size > len(tracks):
                 remaining = total_size - len(tracks)
                 footer = f"\n*... dan {remaining} lagu lainnya*"
                 
                 # If fits in current field
-                if len(current_field_text) + len(footer) <= 1024:
+                if field_length + len(footer) <= field_limit:
                     current_field_text += footer
                 else:
                     # If doesn't fit, add current field then new field for footer (rare but possible)
-                    field_name = f"📋 Antrian ({total_size} lagu)" if current_field_index == 0 else "📋 Antrian (Lanjutan)"
+                    field_name = first_field_name if current_field_index == 0 else next_field_name
                     embed.add_field(name=field_name, value=current_field_text, inline=False)
                     current_field_text = footer
                     current_field_index += 1
 
-            field_name = f"📋 Antrian ({total_size} lagu)" if current_field_index == 0 else "📋 Antrian (Lanjutan)"
+            field_name = first_field_name if current_field_index == 0 else next_field_name
             embed.add_field(name=field_name, value=current_field_text, inline=False)
 
         embed.set_footer(text="Omnia Music 🎶")
@@ -7,7 +7,7 @@ import os
 import re
 import logging
 import asyncio
-from functools import partial
+from functools import lru_cache, partial
 
 import lyricsgenius
 
@@ -45,7 +45,18 @@ NOISE_KEYWORDS = [
     "explicit", "clean"
 ]
 
+# Patterns used by clean_title(), compiled once
+_BRACKETED_RE = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_AMPERSAND_RE = re.compile(r'\s+&\s+')
+# Single alternation; longer phrases are listed first so they win over their parts
+_NOISE_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, NOISE_KEYWORDS)) + r')\b')
+_FEAT_RE = re.compile(r'\b(feat|ft|featuring)\b.*')
+_TRAILING_VERSION_RE = re.compile(r'\b(v?\d+(\.\d+)?)\s*$')
+# extract_metadata() separators: " - ", " : ", " | " (optional spaces for colon/pipe)
+_SEPARATOR_RES = [re.compile(r'\s-\s'), re.compile(r'\s*:\s*'), re.compile(r'\s*\|\s*')]
 
+
+@lru_cache(maxsize=1024)
 def clean_title(title: str) -> str:
     """
     Clean YouTube title aggressively for Genius API search.
@@ -56,35 +67,31 @@ def clean_title(title: str) -> str:
     cleaned = title.lower()
 
     # 1️⃣ Remove content inside () and []
-    cleaned = re.sub(r'\([^)]*\)', '', cleaned)
-    cleaned = re.sub(r'\[[^\]]*\]', '', cleaned)
+    cleaned = _BRACKETED_RE.sub('', cleaned)
     
     # 1.5️⃣ Aggressive separator cutoff: Drop everything after '|'
     if '|' in cleaned:
         cleaned = cleaned.split('|')[0]
 
     # Normalize '&' to 'and'
-    cleaned = re.sub(r'\s+&\s+', ' and ', cleaned)
+    cleaned = _AMPERSAND_RE.sub(' and ', cleaned)
 
     # 2️⃣ Remove common noise keywords
-    for word in NOISE_KEYWORDS:
-        cleaned = re.sub(rf'\b{re.escape(word)}\b', '', cleaned)
+    cleaned = _NOISE_RE.sub('', cleaned)
 
     # 3️⃣ Normalize separators
     # '|' is handled above
     cleaned = cleaned.replace('//', '-')
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = ' '.join(cleaned.split())
 
     # 5️⃣ Remove "feat", "ft", "featuring"
-    cleaned = re.sub(r'\b(feat|ft|featuring)\b.*', '', cleaned)
+    cleaned = _FEAT_RE.sub('', cleaned)
 
     # Remove version numbers like "2.0", "v1", etc ONLY if at end
-    cleaned = re.sub(r'\b(v?\d+(\.\d+)?)\s*$', '', cleaned)
+    cleaned = _TRAILING_VERSION_RE.sub('', cleaned)
 
     # 6️⃣ Final whitespace and separator cleanup
-    cleaned = re.sub(r'\s*[-|]\s*$', '', cleaned)
-    cleaned = re.sub(r'^\s*[-|]\s*', '', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = ' '.join(cleaned.strip(' \t\n-|').split())
 
     return cleaned if cleaned else original
 
@@ -94,16 +101,43 @@ def extract_metadata(query: str) -> dict:
     Attempt to extract artist and title from a query string.
     Returns dict with 'artist' and 'title' if successful, else content is just 'title'.
     """
-    # Common separators: " - ", " : ", " | "
-    # Improved regex to handle optional spaces for colon/pipe, but distinct spaces for dash
-    separators = [r'\s-\s', r'\s*:\s*', r'\s*\|\s*']
-
-    for sep in separators:
-        parts = re.split(sep, query, maxsplit=1)
+    artist, title = _split_artist_title(query)
+    if artist is None:
+        return {'title': title}
+    return {'artist': artist, 'title': title}
+
+
+@lru_cache(maxsize=1024)
+def _split_artist_title(query: str) -> tuple[str | None, str]:
+    """Cached core of extract_metadata(); returns (artist or None, title)."""
+    # Fast path for the usual "Artist - Title"
+    head, sep, tail = query.partition(' - ')
+    if sep:
+        return head.strip(), tail.strip()
+
+    for pattern in _SEPARATOR_RES:
+        parts = pattern.split(query, maxsplit=1)
         if len(parts) == 2:
-            return {'artist': parts[0].strip(), 'title': parts[1].strip()}
+            return parts[0].strip(), parts[1].strip()
+
+    return None, query.strip()
+
 
-    return {'title': query.strip()}
+class _SongNotFound(Exception):
+    """Raised by _genius_lookup so lru_cache never stores a miss."""
+
+
+@lru_cache(maxsize=256)
+def _genius_lookup(title: str, artist: str) -> tuple[str, str, str, str]:
+    """
+    One Genius search, cached per (title, artist). Only hits are cached: a miss
+    raises _SongNotFound, so a flaky or rate-limited empty result can be retried
+    on the next request.
+    """
+    song = _get_genius().search_song(title, artist)
+    if not song:
+        raise _SongNotFound(title)
+    return song.title, song.artist, song.lyrics, song.url
 
 
 def _search_lyrics_sync(title: str, artist: str = "") -> dict | None:
@@ -116,15 +150,14 @@ def _search_lyrics_sync(title: str, artist: str = "") -> dict | None:
 
     for attempt in range(max_retries):
         try:
-            genius = _get_genius()
-            song = genius.search_song(title, artist)
-            if song:
-                return {
-                    'title': song.title,
-                    'artist': song.artist,
-                    'lyrics': song.lyrics,
-                    'url': song.url,
-                }
+            song_title, song_artist, lyrics, url = _genius_lookup(title, artist)
+            return {
+                'title': song_title,
+                'artist': song_artist,
+                'lyrics': lyrics,
+                'url': url,
+            }
+        except _SongNotFound:
             return None  # Song not found, no need to retry
         except Exception as e:
             logger.warning(f"Genius search attempt {attempt + 1}/{max_retries} failed: {e}")
@@ -194,18 +227,22 @@ def split_lyrics(lyrics: str, max_length: int = 4096) -> list[str]:
         return [lyrics]
 
     chunks = []
-    current = ""
+    buf: list[str] = []
+    buf_len = 0
 
     for line in lyrics.split('\n'):
+        add = len(line) + 1
         # Check if adding this line would exceed the limit
-        if len(current) + len(line) + 1 > max_length:
-            if current:
-                chunks.append(current.strip())
-            current = line + '\n'
-        else:
-            current += line + '\n'
-
-    if current.strip():
-        chunks.append(current.strip())
+        if buf_len + add > max_length and buf:
+            chunks.append(''.join(buf).strip())
+            buf.clear()
+            buf_len = 0
+        buf.append(line)
+        buf.append('\n')
+        buf_len += add
+
+    tail = ''.join(buf).strip()
+    if tail:
+        chunks.append(tail)
 
     return chunks
@@ -1,10 +1,33 @@
 
+import asyncio
 import aiohttp
 import logging
 from utils.genius_lyrics import clean_title, extract_metadata
 
 logger = logging.getLogger('omnia.lrclib')
 
+LRCLIB_TIMEOUT = 8
+_session: aiohttp.ClientSession | None = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Shared keep-alive session for lrclib.net (created lazily on the loop)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=LRCLIB_TIMEOUT),
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared lrclib session, if one was opened."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 async def get_lyrics(query: str, duration: int = None) -> dict | None:
     """
     Fetch lyrics from Lrclib API.
@@ -30,47 +53,62 @@ async def get_lyrics(query: str, duration: int = None) -> dict | None:
 
     logger.info(f"Lrclib fetching: {params}")
 
-    async with aiohttp.ClientSession() as session:
+    search_params = {'q': f"{artist_name} {track_name}" if artist_name else track_name}
+    session = _get_session()
+
+    async def _fetch_precise():
+        async with session.get('https://lrclib.net/api/get', params=params) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                # Check if we got valid lyrics
+                if data and (data.get('plainLyrics') or data.get('syncedLyrics')):
+                    return _format_response(data)
+            elif resp.status == 404:
+                logger.info("Lrclib /api/get not found. Using search...")
+            else:
+                logger.warning(f"Lrclib /api/get failed with {resp.status}")
+        return None
+
+    async def _fetch_search():
+        async with session.get('https://lrclib.net/api/search', params=search_params) as resp:
+            if resp.status == 200:
+                results = await resp.json()
+                if results and isinstance(results, list):
+                    # Filter results by duration if available (allow +/- 5 seconds difference)
+                    best_match = None
+                    if duration:
+                        for res in results:
+                            if abs(res.get('duration', 0) - duration) <= 5:
+                                best_match = res
+                                break
+                    
+                    # If no duration match or no duration provided, take the first one
+                    if not best_match and results:
+                        best_match = results[0]
+
+                    if best_match:
+                         return _format_response(best_match)
+        return None
+
+    # Fire both endpoints at once; the precise match still wins when it hits
+    t_get = asyncio.create_task(_fetch_precise())
+    t_search = asyncio.create_task(_fetch_search())
+    try:
         try:
-            # Try precise match first
-            async with session.get('https://lrclib.net/api/get', params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    # Check if we got valid lyrics
-                    if data and (data.get('plainLyrics') or data.get('syncedLyrics')):
-                        return _format_response(data)
-                elif resp.status == 404:
-                    logger.info("Lrclib /api/get not found. Trying search...")
-                else:
-                    logger.warning(f"Lrclib /api/get failed with {resp.status}")
-
-            # Fallback: Search API
-            # If precise match failed, try searching
-            search_params = {'q': f"{artist_name} {track_name}" if artist_name else track_name}
-            async with session.get('https://lrclib.net/api/search', params=search_params) as resp:
-                if resp.status == 200:
-                    results = await resp.json()
-                    if results and isinstance(results, list):
-                        # Filter results by duration if available (allow +/- 5 seconds difference)
-                        best_match = None
-                        if duration:
-                            for res in results:
-                                if abs(res.get('duration', 0) - duration) <= 5:
-                                    best_match = res
-                                    break
-                        
-                        # If no duration match or no duration provided, take the first one
-                        if not best_match and results:
-                            best_match = results[0]
-
-                        if best_match:
-                             return _format_response(best_match)
-        
+            result = await t_get
         except Exception as e:
-            logger.error(f"Lrclib error: {e}")
-            return None
-
-    return None
+            logger.warning(f"Lrclib /api/get error: {e}")
+            result = None
+        if result:
+            return result
+        return await t_search
+    except Exception as e:
+        logger.error(f"Lrclib error: {e}")
+        return None
+    finally:
+        if not t_search.done():
+            t_search.cancel()
+        await asyncio.gather(t_get, t_search, return_exceptions=True)
 
 def _format_response(data: dict) -> dict:
     """Standardize response. User requested PLAIN lyrics only."""
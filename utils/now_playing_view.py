@@ -284,7 +284,7 @@ class NowPlayingView(ui.View):
             chunks = split_lyrics(lyrics_text, max_length=4096)
             
             source = result.get('source', 'Unknown')
-            color = discord.Color.from_rgb(0, 255, 255) if source == 'Lrclib' else discord.Color.from_rgb(255, 255, 100)
+            color = EmbedBuilder.COLOR_LYRICS_SYNCED if source == 'Lrclib' else EmbedBuilder.COLOR_LYRICS
 
             for i, chunk in enumerate(chunks):
                 embed = discord.Embed(
@@ -307,7 +307,7 @@ class NowPlayingView(ui.View):
                 embed.set_footer(text=f"Omnia Music 🎶 • Lyrics powered by {source}")
 
                 msg = await interaction.followup.send(embed=embed, wait=True)
-                self.player.lyrics_messages.append(msg)
+                self.player.track_lyrics_message(msg)
                 if len(self.player.lyrics_messages) > self.MAX_TRACKED_LYRICS_MESSAGES:
                     old_msg = self.player.lyrics_messages.pop(0)
                     try:
@@ -10,8 +10,9 @@ from __future__ import annotations
 
 import asyncio
 import json
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 
 class PlaylistStore:
@@ -23,7 +24,25 @@ class PlaylistStore:
     def __init__(self, path: Path):
         self._path = Path(path)
         self._lock = asyncio.Lock()
-        self._data: Dict[str, List[Dict[str, Any]]] = {}
+        self._data: Dict[str, Any] = {}
+        # guild_id -> slot id -> playlist payload, in insertion (display) order
+        self._playlists: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # guild_id -> normalized playlist name -> slot ids with that name, oldest first
+        self._by_name: Dict[str, Dict[str, Deque[int]]] = {}
+        self._next_slot = 0
+
+    @staticmethod
+    def _name_key(name: Any) -> str:
+        """Normalize a playlist name for case-insensitive lookups."""
+        return str(name or "").strip().lower()
+
+    def _insert(self, gid: str, playlist: Dict[str, Any]):
+        """Add a playlist to the in-memory guild dict and its name index."""
+        slot = self._next_slot
+        self._next_slot += 1
+        self._playlists.setdefault(gid, {})[slot] = playlist
+        names = self._by_name.setdefault(gid, {})
+        names.setdefault(self._name_key(playlist.get("name", "")), deque()).append(slot)
 
     async def _load(self):
         """Load playlists from disk into memory."""
@@ -44,10 +63,15 @@ class PlaylistStore:
             except Exception:
                 # If file is corrupted, reset in-memory structure (do not overwrite on disk yet)
                 self._data = {"guilds": {}}
+            for gid, plist in self._data["guilds"].items():
+                for pl in plist:
+                    self._insert(gid, pl)
 
     async def _save(self):
         """Persist current playlists to disk."""
         async with self._lock:
+            # On-disk format stays a plain list per guild
+            self._data["guilds"] = {gid: list(pls.values()) for gid, pls in self._playlists.items()}
             self._path.parent.mkdir(parents=True, exist_ok=True)
             tmp_path = self._path.with_suffix(".tmp")
             tmp_path.write_text(json.dumps(self._data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -56,8 +80,7 @@ class PlaylistStore:
     async def get_playlists(self, guild_id: int) -> List[Dict[str, Any]]:
         """Return list of playlists for a guild."""
         await self._load()
-        gid = str(guild_id)
-        return list(self._data.get("guilds", {}).get(gid, []))
+        return list(self._playlists.get(str(guild_id), {}).values())
 
     async def add_playlist(self, guild_id: int, playlist: Dict[str, Any]) -> (bool, Optional[str]):
         """
@@ -66,10 +89,8 @@ class PlaylistStore:
         """
         await self._load()
         gid = str(guild_id)
-        guilds = self._data.setdefault("guilds", {})
-        plist = guilds.setdefault(gid, [])
 
-        if len(plist) >= self.MAX_PLAYLISTS:
+        if len(self._playlists.get(gid, ())) >= self.MAX_PLAYLISTS:
             return False, "FULL"
 
         # Enforce track limit when saving
@@ -78,7 +99,7 @@ class PlaylistStore:
             playlist = dict(playlist)
             playlist["tracks"] = tracks[: self.MAX_TRACKS]
 
-        plist.append(playlist)
+        self._insert(gid, playlist)
         await self._save()
         return True, None
 
@@ -89,18 +110,21 @@ class PlaylistStore:
         """
         await self._load()
         gid = str(guild_id)
-        guilds = self._data.setdefault("guilds", {})
-        plist = guilds.get(gid)
-        if not plist:
+        names = self._by_name.get(gid)
+        if not names:
             return False
 
-        name_lower = name.strip().lower()
-        for idx, pl in enumerate(plist):
-            if str(pl.get("name", "")).strip().lower() == name_lower:
-                del plist[idx]
-                if not plist:
-                    guilds.pop(gid, None)
-                await self._save()
-                return True
-        return False
+        key = self._name_key(name)
+        slots = names.get(key)
+        if not slots:
+            return False
 
+        # Oldest slot first; any later playlist with the same name stays indexed
+        self._playlists[gid].pop(slots.popleft())
+        if not slots:
+            del names[key]
+        if not self._playlists[gid]:
+            del self._playlists[gid]
+            del self._by_name[gid]
+        await self._save()
+        return True
@@ -11,6 +11,8 @@ import os
 from urllib.parse import quote
 from urllib.request import Request, urlopen
 
+from utils.text_utils import truncate
+
 logger = logging.getLogger("omnia.radio")
 
 RADIO_BROWSER_BASES = [
@@ -195,9 +197,7 @@ class RadioBrowserClient:
         if tags:
             desc_bits.append(", ".join(tags[:3]))
 
-        description = " • ".join(desc_bits) if desc_bits else "Radio stream"
-        if len(description) > 100:
-            description = description[:97] + "..."
+        description = truncate(" • ".join(desc_bits) if desc_bits else "Radio stream", 100)
 
         return {
             "uuid": uuid,
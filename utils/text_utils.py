@@ -0,0 +1,14 @@
+"""
+Small text helpers shared by embeds and select menus.
+"""
+
+from __future__ import annotations
+
+ELLIPSIS = "…"
+
+
+def truncate(text: str, limit: int) -> str:
+    """Clip `text` to at most `limit` characters, ending with an ellipsis when cut."""
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1] + ELLIPSIS